@@ -3,10 +3,11 @@ Gestionnaire intelligent de modèles Gemini avec retry et fallback
 VERSION OPTIMISÉE : 1 tentative par modèle avant switch
 """
 
+import asyncio
 import logging
+import random
 from typing import Optional, Callable, Any, Dict
 from enum import Enum
-import time
 from google import genai
 from google.genai import errors as genai_errors
 from google.api_core import exceptions as google_exceptions
@@ -29,11 +30,15 @@ class ModelRetryStrategy:
     - Timeout → 1 tentative puis switch (pas 3 tentatives)
     - 503 (serveur indisponible) → Switch vers Flash Lite
     - 429 sur les deux modèles → Erreur finale
+    - Autres 4xx (400, 403...) → Échec immédiat, sans retry ni switch
+    - Attente entre retries : "full jitter", uniforme entre 0 et
+      min(max_backoff, retry_delay * 2^(tentative-1)), sans bloquer la boucle
     """
 
-    def __init__(self, max_retries: int = 1, retry_delay: float = 2.0):
+    def __init__(self, max_retries: int = 1, retry_delay: float = 2.0, max_backoff: float = 60.0):
         self.max_retries = max_retries  # ← 1 seule tentative par défaut
         self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
         self.current_model = GeminiModel.FLASH
 
     async def execute_with_retry(
@@ -71,8 +76,18 @@ class ModelRetryStrategy:
                         "attempts": attempt
                     }
 
-                except google_exceptions.ResourceExhausted as e:
-                    # 429 - Quota expiré → Switch immédiat
+                except (google_exceptions.ResourceExhausted, genai_errors.ClientError) as e:
+                    if isinstance(e, genai_errors.ClientError) and e.code != 429:
+                        # Erreurs client (4xx autres que 429) : inutile de réessayer
+                        status = e.code
+                        logger.error(f"❌ Erreur client {status} sur {model.value}: {str(e)[:200]}")
+                        return {
+                            "success": False,
+                            "error": "client_error",
+                            "message": f"Erreur de requête Gemini ({status}): {str(e)[:200]}"
+                        }
+
+                    # 429 - Quota expiré (api_core ou ClientError du SDK google.genai) → Switch immédiat
                     logger.warning(f"⚠️ Quota expiré sur {model.value}: {str(e)}")
 
                     if model == GeminiModel.FLASH:
@@ -93,9 +108,9 @@ class ModelRetryStrategy:
                     logger.warning(f"⏱️ Timeout sur {model.value} (tentative {attempt}/{self.max_retries}): {str(e)}")
 
                     if attempt < self.max_retries:
-                        wait_time = self.retry_delay * attempt
-                        logger.info(f"⏳ Attente de {wait_time}s avant retry...")
-                        time.sleep(wait_time)
+                        wait_time = random.uniform(0, min(self.max_backoff, self.retry_delay * 2 ** (attempt - 1)))
+                        logger.info(f"⏳ Attente de {wait_time:.1f}s avant retry...")
+                        await asyncio.sleep(wait_time)
                         continue
                     else:
                         if model == GeminiModel.FLASH:
@@ -116,7 +131,7 @@ class ModelRetryStrategy:
 
                 except genai_errors.ServerError as e:
                     # 503 UNAVAILABLE ou autres erreurs serveur temporaires
-                    status = getattr(e, 'status_code', 503)
+                    status = getattr(e, 'code', 503)
                     logger.warning(f"⚠️ Erreur serveur {status} sur {model.value}: {str(e)[:100]}")
 
                     if model == GeminiModel.FLASH:
@@ -132,16 +147,6 @@ class ModelRetryStrategy:
                             )
                         }
 
-                except genai_errors.ClientError as e:
-                    # Erreurs client (4xx autres que 429)
-                    status = getattr(e, 'status_code', 400)
-                    logger.error(f"❌ Erreur client {status} sur {model.value}: {str(e)[:200]}")
-                    return {
-                        "success": False,
-                        "error": "client_error",
-                        "message": f"Erreur de requête Gemini ({status}): {str(e)[:200]}"
-                    }
-
                 except Exception as e:
                     # Autre erreur inattendue
                     logger.error(f"❌ Erreur inattendue avec {model.value}: {str(e)}", exc_info=True)
@@ -172,6 +177,10 @@ class GeminiModelManager:
         """Retourne l'objet models du client (nouveau SDK google.genai)"""
         return self.client.models
 
+    def get_async_model(self, model_name: str):
+        """Retourne l'objet models asynchrone du client (client.aio : appels awaitables, sans thread)"""
+        return self.client.aio.models
+
     async def execute_with_fallback(
         self,
         task_func: Callable,
@@ -144,13 +144,13 @@ class ASTBuilder:
         
         for para in paragraphs:
             # Ignorer les paragraphes vides ou génériques
-            if not para.get("statements") or self._is_generic_paragraph(para["name"]):
+            if not para.statements or self._is_generic_paragraph(para.name):
                 continue
             
-            paragraph = Paragraph(name=para["name"])
+            paragraph = Paragraph(name=para.name)
             
             # Reconstruire le flux de contrôle
-            statements = para["statements"]
+            statements = para.statements
             i = 0
             while i < len(statements):
                 flow, consumed = self._build_control_flow(statements, i)
@@ -160,10 +160,10 @@ class ASTBuilder:
             
             self.paragraphs.append(paragraph)
     
-    def _build_control_flow(self, statements: List[Dict], start: int) -> tuple:
+    def _build_control_flow(self, statements: List[Any], start: int) -> tuple:
         """Reconstruit une structure de contrôle à partir des statements"""
         stmt = statements[start]
-        stmt_type = stmt.get("type")
+        stmt_type = stmt.type
         
         # IF statement
         if stmt_type == "If":
@@ -173,8 +173,8 @@ class ASTBuilder:
         elif stmt_type == "Perform":
             flow = ControlFlow(
                 type="call",
-                target=stmt.get("target"),
-                condition=stmt.get("until_condition")
+                target=stmt.target,
+                condition=stmt.until_condition
             )
             return flow, 1
         
@@ -182,8 +182,8 @@ class ASTBuilder:
         elif stmt_type == "Compute":
             flow = ControlFlow(
                 type="compute",
-                target=stmt.get("target"),
-                expression=stmt.get("expression")
+                target=stmt.target,
+                expression=stmt.expression
             )
             return flow, 1
         
@@ -191,7 +191,7 @@ class ASTBuilder:
         elif stmt_type == "Move":
             flow = ControlFlow(
                 type="assign",
-                expression=f"{stmt.get('source')} → {', '.join(stmt.get('targets', []))}"
+                expression=f"{stmt.source} → {', '.join(stmt.targets)}"
             )
             return flow, 1
         
@@ -199,7 +199,7 @@ class ASTBuilder:
         elif stmt_type == "Initialize":
             flow = ControlFlow(
                 type="initialize",
-                target=", ".join(stmt.get("targets", []))
+                target=", ".join(stmt.targets)
             )
             return flow, 1
         
@@ -210,12 +210,12 @@ class ASTBuilder:
         
         return None, 1
     
-    def _build_if_block(self, statements: List[Dict], start: int) -> tuple:
+    def _build_if_block(self, statements: List[Any], start: int) -> tuple:
         """Reconstruit un bloc IF/THEN/ELSE complet"""
         if_stmt = statements[start]
         flow = ControlFlow(
             type="if",
-            condition=if_stmt.get("condition")
+            condition=if_stmt.condition
         )
         
         i = start + 1
@@ -224,10 +224,10 @@ class ASTBuilder:
         while i < len(statements):
             stmt = statements[i]
             
-            if stmt.get("type") == "EndIf":
+            if stmt.type == "EndIf":
                 return flow, i - start + 1
             
-            elif stmt.get("type") == "Else":
+            elif stmt.type == "Else":
                 in_else = True
                 i += 1
                 continue
@@ -6,7 +6,7 @@ Génère un AST sémantique structuré, pas un dump syntaxique
 import json
 from typing import Dict, Any
 from parsers.data_division_parser import DataDivisionParser
-from parsers.procedure_division_parser import ProcedureDivisionParser
+from parsers.procedure_division_parser import make_parser as make_procedure_parser
 from parsers.ast_builder import ASTBuilder
 
 
@@ -49,7 +49,7 @@ class COBOLParser:
         raw_ast["data_division"] = data_parser.parse()
         
         # Procedure Division
-        proc_parser = ProcedureDivisionParser(self.lines, self.has_line_nums)
+        proc_parser = make_procedure_parser(self.lines, self.has_line_nums)
         raw_ast["procedure_division"] = proc_parser.parse()
         
         return raw_ast
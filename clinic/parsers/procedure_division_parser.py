@@ -5,9 +5,210 @@ Gère : USING clause, paragraphes, statements
 """
 
 import re
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Tuple
 
 
+# Blancs sans saut de ligne : la recherche se fait sur le source complet
+_RE_PROC_DIV = re.compile(r'PROCEDURE[^\S\n]+DIVISION', re.IGNORECASE)
+_RE_USING = re.compile(r'USING\s+(.+?)\.', re.IGNORECASE)
+_RE_UNTIL = re.compile(r'UNTIL\s+(.+?)$', re.IGNORECASE)
+# Détection paragraphe : NNNN-NAME. ou NAME.
+_RE_PARA_HEADER = re.compile(r'^([0-9]{4}-[A-Z0-9\-]+|[A-Z][A-Z0-9\-]*)\.$', re.IGNORECASE)
+# Séparateurs d'opérandes (tout blanc autour : espaces multiples, tabulations)
+_RE_SEP_TO = re.compile(r'\s+TO\s+', re.IGNORECASE)
+_RE_ARITH_SEPARATORS = {
+    "ADD": _RE_SEP_TO,
+    "SUBTRACT": re.compile(r'\s+FROM\s+', re.IGNORECASE),
+    "MULTIPLY": re.compile(r'\s+BY\s+', re.IGNORECASE),
+    "DIVIDE": re.compile(r'\s+(?:INTO|BY)\s+', re.IGNORECASE),
+}
+
+# ============================================================
+# Noeuds de l'AST brut (slots : empreinte mémoire réduite)
+# to_dict explicite : "type" en tête, line_number en fin (ordre des clés historique)
+# ============================================================
+
+@dataclass(slots=True)
+class Statement:
+    """Statement générique (Else, EndIf, Exit, NextSentence, ...)"""
+    type: str
+    line_number: str
+    keyword: Optional[str] = None
+    content: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        result = {"type": self.type}
+        if self.keyword is not None:
+            result["keyword"] = self.keyword
+        if self.content is not None:
+            result["content"] = self.content
+        result["line_number"] = self.line_number
+        return result
+
+
+@dataclass(slots=True)
+class Perform:
+    line_number: str
+    target: Optional[str] = None
+    varying: Optional[str] = None
+    from_value: Optional[str] = None
+    by_value: Optional[str] = None
+    until_condition: Optional[str] = None
+    times: Optional[int] = None
+    type: str = "Perform"
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": self.type,
+            "target": self.target,
+            "varying": self.varying,
+            "from_value": self.from_value,
+            "by_value": self.by_value,
+            "until_condition": self.until_condition,
+            "times": self.times,
+            "line_number": self.line_number
+        }
+
+
+@dataclass(slots=True)
+class If:
+    line_number: str
+    condition: str
+    type: str = "If"
+
+    def to_dict(self) -> Dict:
+        return {"type": self.type, "condition": self.condition, "line_number": self.line_number}
+
+
+@dataclass(slots=True)
+class Compute:
+    line_number: str
+    target: Optional[str] = None
+    rounded: bool = False
+    expression: Optional[str] = None
+    type: str = "Compute"
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": self.type,
+            "target": self.target,
+            "rounded": self.rounded,
+            "expression": self.expression,
+            "line_number": self.line_number
+        }
+
+
+@dataclass(slots=True)
+class Move:
+    line_number: str
+    source: Optional[str] = None
+    targets: List[str] = field(default_factory=list)
+    type: str = "Move"
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": self.type,
+            "source": self.source,
+            "targets": list(self.targets),
+            "line_number": self.line_number
+        }
+
+
+@dataclass(slots=True)
+class Initialize:
+    line_number: str
+    targets: List[str] = field(default_factory=list)
+    type: str = "Initialize"
+
+    def to_dict(self) -> Dict:
+        return {"type": self.type, "targets": list(self.targets), "line_number": self.line_number}
+
+
+@dataclass(slots=True)
+class Call:
+    line_number: str
+    program: Optional[str] = None
+    using: List[str] = field(default_factory=list)
+    type: str = "Call"
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": self.type,
+            "program": self.program,
+            "using": list(self.using),
+            "line_number": self.line_number
+        }
+
+
+@dataclass(slots=True)
+class Display:
+    line_number: str
+    items: List[str] = field(default_factory=list)
+    type: str = "Display"
+
+    def to_dict(self) -> Dict:
+        return {"type": self.type, "items": list(self.items), "line_number": self.line_number}
+
+
+@dataclass(slots=True)
+class Accept:
+    line_number: str
+    variable: Optional[str] = None
+    type: str = "Accept"
+
+    def to_dict(self) -> Dict:
+        return {"type": self.type, "variable": self.variable, "line_number": self.line_number}
+
+
+@dataclass(slots=True)
+class Copy:
+    line_number: str
+    copybook: Optional[str] = None
+    type: str = "Copy"
+
+    def to_dict(self) -> Dict:
+        return {"type": self.type, "copybook": self.copybook, "line_number": self.line_number}
+
+
+@dataclass(slots=True)
+class Arithmetic:
+    line_number: str
+    operation: str
+    operand1: Optional[str] = None
+    operand2: Optional[str] = None
+    rounded: bool = False
+    giving: Optional[str] = None
+    type: str = "Arithmetic"
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": self.type,
+            "operation": self.operation,
+            "operand1": self.operand1,
+            "operand2": self.operand2,
+            "rounded": self.rounded,
+            "giving": self.giving,
+            "line_number": self.line_number
+        }
+
+
+@dataclass(slots=True)
+class Paragraph:
+    name: str
+    line_number: str
+    statements: List[Any] = field(default_factory=list)
+    type: str = "Paragraph"
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": self.type,
+            "name": self.name,
+            "line_number": self.line_number,
+            "statements": [s.to_dict() for s in self.statements]
+        }
+
+
 class ProcedureDivisionParser:
     """Parser spécialisé pour PROCEDURE DIVISION"""
     
@@ -27,18 +228,38 @@ class ProcedureDivisionParser:
         return stripped.startswith('*') or stripped.startswith('/')
     
     def _find_division_bounds(self) -> Tuple[int, int]:
-        """Trouve les bornes de PROCEDURE DIVISION"""
-        start_idx = -1
+        """
+        Trouve les bornes de PROCEDURE DIVISION
+        Une seule recherche regex sur le source complet plutôt qu'une
+        par ligne ; l'offset trouvé est ramené à un index de ligne
+        (les matchs en commentaire sont sautés).
+        """
         end_idx = len(self.lines)
+        source = "\n".join(self.lines)
+        pos = 0
         
-        for i, line in enumerate(self.lines):
-            _, content = self._clean_line(line)
+        while True:
+            match = _RE_PROC_DIV.search(source, pos)
+            if not match:
+                return -1, end_idx
             
-            if re.search(r'PROCEDURE\s+DIVISION', content, re.IGNORECASE):
-                start_idx = i
-                break
-        
-        return start_idx, end_idx
+            line_start = source.rfind("\n", 0, match.start()) + 1
+            # Ignorer un match dans la zone des numéros de ligne (col. 1-6)
+            if self.has_line_nums and match.start() - line_start < 6:
+                pos = match.start() + 1
+                continue
+            
+            line_idx = source.count("\n", 0, line_start)
+            # Ignorer une ligne de commentaire qui mentionne la division
+            _, content = self._clean_line(self.lines[line_idx])
+            if self._is_comment(content):
+                line_end = source.find("\n", match.end())
+                if line_end == -1:
+                    return -1, end_idx
+                pos = line_end + 1
+                continue
+            
+            return line_idx, end_idx
     
     def parse(self) -> Optional[Dict[str, Any]]:
         """Parse la PROCEDURE DIVISION complète"""
@@ -63,40 +284,25 @@ class ProcedureDivisionParser:
     def _parse_using_clause(self, start: int, end: int) -> Tuple[Optional[List[str]], int]:
         """
         Parse la clause USING qui peut s'étendre sur plusieurs lignes
+        `start` est l'index de l'en-tête PROCEDURE DIVISION (déjà localisé
+        par _find_division_bounds), on accumule donc directement à partir de là.
         Returns: (liste des paramètres, index de début des paragraphes)
         """
-        i = start
-        using_line = ""
+        _, content = self._clean_line(self.lines[start])
+        using_parts = [content.strip()]
         proc_start = start + 1
         
-        # Chercher PROCEDURE DIVISION et accumuler jusqu'au point
-        while i < min(start + 20, end):
-            _, content = self._clean_line(self.lines[i])
-            
-            if not content.strip() or self._is_comment(content):
-                i += 1
-                continue
-            
-            if 'PROCEDURE' in content.upper() and 'DIVISION' in content.upper():
-                using_line = content
-                proc_start = i + 1
-                
-                # Continuer à accumuler si pas de point
-                j = i + 1
-                while j < end and not using_line.rstrip().endswith('.'):
-                    _, next_content = self._clean_line(self.lines[j])
-                    if next_content.strip() and not self._is_comment(next_content):
-                        using_line += " " + next_content.strip()
-                        proc_start = j + 1
-                    j += 1
-                break
-            i += 1
-        
-        if not using_line:
-            return None, start + 1
+        # Continuer à accumuler jusqu'au point
+        j = start + 1
+        while j < end and not using_parts[-1].endswith('.'):
+            _, next_content = self._clean_line(self.lines[j])
+            if next_content.strip() and not self._is_comment(next_content):
+                using_parts.append(next_content.strip())
+                proc_start = j + 1
+            j += 1
         
         # Extraire USING
-        using_match = re.search(r'USING\s+(.+?)\.', using_line, re.IGNORECASE)
+        using_match = _RE_USING.search(" ".join(using_parts))
         if using_match:
             params_str = using_match.group(1)
             # Split par whitespace/newline
@@ -105,7 +311,7 @@ class ProcedureDivisionParser:
         
         return None, proc_start
     
-    def _parse_paragraphs(self, start: int, end: int) -> List[Dict]:
+    def _parse_paragraphs(self, start: int, end: int) -> List[Paragraph]:
         """Parse tous les paragraphes"""
         paragraphs = []
         current_paragraph = None
@@ -124,8 +330,7 @@ class ProcedureDivisionParser:
             
             # Détection paragraphe : NNNN-NAME. ou NAME.
             # Critère : ligne se terminant par un point, pas de verbe COBOL
-            para_match = re.match(r'^([0-9]{4}-[A-Z0-9\-]+|[A-Z][A-Z0-9\-]*)\.$', 
-                                 content.strip(), re.IGNORECASE)
+            para_match = _RE_PARA_HEADER.match(content.strip())
             
             if para_match:
                 # Sauvegarder le paragraphe précédent
@@ -133,13 +338,7 @@ class ProcedureDivisionParser:
                     paragraphs.append(current_paragraph)
                 
                 # Nouveau paragraphe
-                para_name = para_match.group(1).rstrip('.')
-                current_paragraph = {
-                    "type": "Paragraph",
-                    "name": para_name,
-                    "line_number": line_num,
-                    "statements": []
-                }
+                current_paragraph = Paragraph(name=para_match.group(1), line_number=line_num)
                 i += 1
                 continue
             
@@ -147,7 +346,7 @@ class ProcedureDivisionParser:
             if current_paragraph:
                 statement, lines_consumed = self._parse_statement_multiline(i, end)
                 if statement:
-                    current_paragraph["statements"].append(statement)
+                    current_paragraph.statements.append(statement)
                 i += lines_consumed
             else:
                 i += 1
@@ -158,7 +357,7 @@ class ProcedureDivisionParser:
         
         return paragraphs
     
-    def _parse_statement_multiline(self, start_idx: int, end_idx: int) -> Tuple[Optional[Dict], int]:
+    def _parse_statement_multiline(self, start_idx: int, end_idx: int) -> Tuple[Optional[Any], int]:
         """Parse un statement qui peut s'étendre sur plusieurs lignes"""
         accumulated = ""
         line_num_start = ""
@@ -189,7 +388,9 @@ class ProcedureDivisionParser:
                content.strip().upper() in ['END-IF', 'END-PERFORM', 'ELSE']:
                 break
         
-        accumulated = accumulated.strip()
+        # Point final retiré une seule fois ici : les parsers feuilles
+        # reçoivent un statement sans point terminal
+        accumulated = accumulated.strip().rstrip('.')
         if not accumulated:
             return None, max(1, lines_consumed)
         
@@ -197,7 +398,7 @@ class ProcedureDivisionParser:
         statement = self._parse_statement(accumulated, line_num_start)
         return statement, max(1, lines_consumed)
     
-    def _parse_statement(self, line: str, line_num: str) -> Optional[Dict]:
+    def _parse_statement(self, line: str, line_num: str) -> Optional[Any]:
         """Parse un statement COBOL complet"""
         line_upper = line.upper().lstrip()
         
@@ -207,9 +408,9 @@ class ProcedureDivisionParser:
         elif line_upper.startswith('IF '):
             return self._parse_if(line, line_num)
         elif line_upper.startswith('ELSE'):
-            return {"type": "Else", "line_number": line_num}
+            return Statement(type="Else", line_number=line_num)
         elif line_upper.startswith('END-IF'):
-            return {"type": "EndIf", "line_number": line_num}
+            return Statement(type="EndIf", line_number=line_num)
         elif line_upper.startswith('COMPUTE'):
             return self._parse_compute(line, line_num)
         elif line_upper.startswith('MOVE'):
@@ -219,192 +420,156 @@ class ProcedureDivisionParser:
         elif line_upper.startswith('CALL'):
             return self._parse_call(line, line_num)
         elif re.match(r'^(GOBACK|STOP\s+RUN|EXIT)', line_upper):
-            return {
-                "type": "Exit",
-                "keyword": line_upper.split()[0],
-                "line_number": line_num
-            }
+            return Statement(type="Exit", line_number=line_num,
+                             keyword=line_upper.split(None, 1)[0])
         elif line_upper.startswith('DISPLAY'):
             return self._parse_display(line, line_num)
         elif line_upper.startswith('ACCEPT'):
             match = re.search(r'ACCEPT\s+(.+)', line, re.IGNORECASE)
-            return {
-                "type": "Accept",
-                "variable": match.group(1).rstrip('.') if match else None,
-                "line_number": line_num
-            }
+            return Accept(
+                line_number=line_num,
+                variable=match.group(1) if match else None
+            )
         elif re.match(r'^(ADD|SUBTRACT|MULTIPLY|DIVIDE)', line_upper):
             return self._parse_arithmetic(line, line_num)
         elif line_upper.startswith('COPY'):
             match = re.search(r'COPY\s+([A-Z0-9\-]+)', line, re.IGNORECASE)
-            return {
-                "type": "Copy",
-                "copybook": match.group(1) if match else None,
-                "line_number": line_num
-            }
+            return Copy(line_number=line_num,
+                        copybook=match.group(1) if match else None)
         elif 'NEXT SENTENCE' in line_upper:
-            return {"type": "NextSentence", "line_number": line_num}
+            return Statement(type="NextSentence", line_number=line_num)
         else:
             # Statement générique
-            keyword = line.split()[0].upper() if line.split() else "UNKNOWN"
-            return {
-                "type": "Statement",
-                "keyword": keyword,
-                "content": line.rstrip('.'),
-                "line_number": line_num
-            }
+            first = line.split(None, 1)
+            keyword = first[0].upper() if first else "UNKNOWN"
+            return Statement(type="Statement", line_number=line_num,
+                             keyword=keyword, content=line)
     
     # Les méthodes _parse_perform, _parse_if, etc. suivent...
     # (Identiques à la version précédente mais nettoyées)
     
-    def _parse_perform(self, line: str, line_num: str) -> Dict:
+    def _parse_perform(self, line: str, line_num: str) -> Perform:
         """Parse PERFORM"""
-        perform = {
-            "type": "Perform",
-            "target": None,
-            "varying": None,
-            "from_value": None,
-            "by_value": None,
-            "until_condition": None,
-            "times": None,
-            "line_number": line_num
-        }
+        perform = Perform(line_number=line_num)
         
         target_match = re.search(r'PERFORM\s+([A-Z0-9\-]+)', line, re.IGNORECASE)
         if target_match:
-            perform["target"] = target_match.group(1)
+            perform.target = target_match.group(1)
         
         varying_match = re.search(r'VARYING\s+([A-Z0-9\-]+)\s+FROM\s+(.+?)\s+BY\s+(.+?)\s+UNTIL', 
                                  line, re.IGNORECASE)
         if varying_match:
-            perform["varying"] = varying_match.group(1)
-            perform["from_value"] = varying_match.group(2).strip()
-            perform["by_value"] = varying_match.group(3).strip()
+            perform.varying = varying_match.group(1)
+            perform.from_value = varying_match.group(2).strip()
+            perform.by_value = varying_match.group(3).strip()
         
-        until_match = re.search(r'UNTIL\s+(.+?)(?:\.|$)', line, re.IGNORECASE)
+        until_match = _RE_UNTIL.search(line)
         if until_match:
-            perform["until_condition"] = until_match.group(1).strip()
+            perform.until_condition = until_match.group(1).strip()
         
         times_match = re.search(r'PERFORM\s+(\d+)\s+TIMES', line, re.IGNORECASE)
         if times_match:
-            perform["times"] = int(times_match.group(1))
+            perform.times = int(times_match.group(1))
         
         return perform
     
-    def _parse_if(self, line: str, line_num: str) -> Dict:
+    def _parse_if(self, line: str, line_num: str) -> If:
         """Parse IF"""
         match = re.search(r'IF\s+(.+?)(?:\s+THEN|$)', line, re.IGNORECASE)
         condition = match.group(1).strip() if match else line[2:].strip()
         
-        return {
-            "type": "If",
-            "condition": condition.rstrip('.'),
-            "line_number": line_num
-        }
+        return If(line_number=line_num, condition=condition)
     
-    def _parse_compute(self, line: str, line_num: str) -> Dict:
+    def _parse_compute(self, line: str, line_num: str) -> Compute:
         """Parse COMPUTE"""
         match = re.search(r'COMPUTE\s+([A-Z0-9\-]+)\s*(ROUNDED)?\s*=\s*(.+)', 
                          line, re.IGNORECASE)
         
         if match:
-            return {
-                "type": "Compute",
-                "target": match.group(1),
-                "rounded": match.group(2) is not None,
-                "expression": match.group(3).rstrip('.'),
-                "line_number": line_num
-            }
+            return Compute(
+                line_number=line_num,
+                target=match.group(1),
+                rounded=match.group(2) is not None,
+                expression=match.group(3)
+            )
+        
+        return Compute(line_number=line_num)
+    
+    @staticmethod
+    def _split_on_keyword(line: str, keyword: str,
+                          separator: "re.Pattern[str]") -> Optional[Tuple[str, str]]:
+        """
+        Coupe `KEYWORD op1 SEP op2` au premier séparateur entouré de blancs
+        (regex précompilée, recherchée après le mot-clé : pas de `.+?` à backtracker).
+        Returns: (op1, op2) ou None si la forme n'est pas reconnue
+        """
+        start = len(keyword)
+        # op1 commence au premier non-blanc après le mot-clé ; le séparateur vient après
+        op_start = len(line) - len(line[start:].lstrip())
+        sep_match = separator.search(line, op_start + 1)
+        if not sep_match:
+            return None
         
-        return {
-            "type": "Compute",
-            "target": None,
-            "rounded": False,
-            "expression": None,
-            "line_number": line_num
-        }
+        op1 = line[op_start:sep_match.start()].strip()
+        op2 = line[sep_match.end():].strip()
+        if not op1 or not op2:
+            return None
+        return op1, op2
     
-    def _parse_move(self, line: str, line_num: str) -> Dict:
+    def _parse_move(self, line: str, line_num: str) -> Move:
         """Parse MOVE"""
-        match = re.search(r'MOVE\s+(.+?)\s+TO\s+(.+)', line, re.IGNORECASE)
+        parts = self._split_on_keyword(line, "MOVE", _RE_SEP_TO)
         
-        if match:
-            source = match.group(1).strip()
-            targets_str = match.group(2).rstrip('.')
-            targets = [t.strip() for t in re.split(r'\s+', targets_str) if t.strip()]
-            
-            return {
-                "type": "Move",
-                "source": source,
-                "targets": targets,
-                "line_number": line_num
-            }
+        if parts:
+            source, targets_str = parts
+            return Move(line_number=line_num, source=source, targets=targets_str.split())
         
-        return {
-            "type": "Move",
-            "source": None,
-            "targets": [],
-            "line_number": line_num
-        }
+        return Move(line_number=line_num)
     
-    def _parse_initialize(self, line: str, line_num: str) -> Dict:
+    def _parse_initialize(self, line: str, line_num: str) -> Initialize:
         """Parse INITIALIZE"""
         match = re.search(r'INITIALIZE\s+(.+)', line, re.IGNORECASE)
         targets = []
         
         if match:
-            targets_str = match.group(1).rstrip('.')
+            targets_str = match.group(1)
             targets = [t.strip() for t in targets_str.split() if t.strip()]
         
-        return {
-            "type": "Initialize",
-            "targets": targets,
-            "line_number": line_num
-        }
+        return Initialize(line_number=line_num, targets=targets)
     
-    def _parse_call(self, line: str, line_num: str) -> Dict:
+    def _parse_call(self, line: str, line_num: str) -> Call:
         """Parse CALL"""
         match = re.search(r'CALL\s+["\']([^"\']+)["\']', line, re.IGNORECASE)
         
-        call = {
-            "type": "Call",
-            "program": match.group(1) if match else None,
-            "using": [],
-            "line_number": line_num
-        }
+        call = Call(line_number=line_num,
+                    program=match.group(1) if match else None)
         
         using_match = re.search(r'USING\s+(.+)', line, re.IGNORECASE)
         if using_match:
-            params = using_match.group(1).rstrip('.').split()
-            call["using"] = params
+            params = using_match.group(1).split()
+            call.using = params
         
         return call
     
-    def _parse_display(self, line: str, line_num: str) -> Dict:
+    def _parse_display(self, line: str, line_num: str) -> Display:
         """Parse DISPLAY"""
         match = re.search(r'DISPLAY\s+(.+)', line, re.IGNORECASE)
         
-        return {
-            "type": "Display",
-            "items": match.group(1).rstrip('.').split() if match else [],
-            "line_number": line_num
-        }
+        return Display(
+            line_number=line_num,
+            items=match.group(1).split() if match else []
+        )
     
-    def _parse_arithmetic(self, line: str, line_num: str) -> Dict:
+    def _parse_arithmetic(self, line: str, line_num: str) -> Arithmetic:
         """Parse arithmétique"""
-        keyword = line.split()[0].upper()
+        keyword = line.split(None, 1)[0].upper()
         
-        patterns = {
-            "ADD": r'ADD\s+(.+?)\s+TO\s+(.+)',
-            "SUBTRACT": r'SUBTRACT\s+(.+?)\s+FROM\s+(.+)',
-            "MULTIPLY": r'MULTIPLY\s+(.+?)\s+BY\s+(.+)',
-            "DIVIDE": r'DIVIDE\s+(.+?)\s+(?:INTO|BY)\s+(.+)'
-        }
+        separator = _RE_ARITH_SEPARATORS.get(keyword)
         
-        if keyword in patterns:
-            match = re.search(patterns[keyword], line, re.IGNORECASE)
-            if match:
-                operand2 = match.group(2).rstrip('.')
+        if separator is not None:
+            parts = self._split_on_keyword(line, keyword, separator)
+            if parts:
+                operand1, operand2 = parts
                 rounded = 'ROUNDED' in operand2.upper()
                 giving = None
                 
@@ -415,22 +580,38 @@ class ProcedureDivisionParser:
                 
                 operand2 = re.sub(r'ROUNDED', '', operand2, flags=re.IGNORECASE).strip()
                 
-                return {
-                    "type": "Arithmetic",
-                    "operation": keyword,
-                    "operand1": match.group(1).strip(),
-                    "operand2": operand2,
-                    "rounded": rounded,
-                    "giving": giving,
-                    "line_number": line_num
-                }
-        
-        return {
-            "type": "Arithmetic",
-            "operation": keyword,
-            "operand1": None,
-            "operand2": None,
-            "rounded": False,
-            "giving": None,
-            "line_number": line_num
-        }
+                return Arithmetic(
+                    line_number=line_num,
+                    operation=keyword,
+                    operand1=operand1,
+                    operand2=operand2,
+                    rounded=rounded,
+                    giving=giving
+                )
+        
+        return Arithmetic(line_number=line_num, operation=keyword)
+
+
+class _ProcParserWithNums(ProcedureDivisionParser):
+    """Variante spécialisée : colonnes 1-6 = numéros de ligne"""
+
+    def _clean_line(self, line: str) -> Tuple[str, str]:
+        if len(line) >= 6:
+            return line[:6].strip(), line[6:].rstrip()
+        return "", line.rstrip()
+
+
+class _ProcParserNoNums(ProcedureDivisionParser):
+    """Variante spécialisée : pas de numéros de ligne"""
+
+    def _clean_line(self, line: str) -> Tuple[str, str]:
+        return "", line.rstrip()
+
+
+def make_parser(lines: List[str], has_line_nums: bool) -> ProcedureDivisionParser:
+    """
+    Retourne un parser dont _clean_line est spécialisé selon has_line_nums
+    (constant pour tout le fichier) : plus de branche par ligne.
+    """
+    cls = _ProcParserWithNums if has_line_nums else _ProcParserNoNums
+    return cls(lines, has_line_nums)
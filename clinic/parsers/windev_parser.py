@@ -1,9 +1,73 @@
 import re
 import json
-from typing import List, Dict, Any, Optional, Set
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Sequence, Set
 from enum import Enum
 
+
+# Patterns précompilés (évite le lookup du cache `re` à chaque ligne)
+_RE_PROC = re.compile(r'PROC[ÉE]DURE\s+(\w+)\s*\((.*?)\)', re.IGNORECASE)
+_RE_VAR_DECL = re.compile(r'(\w+)\s+est\s+un(?:e)?\s+([\w\s<>]+?)(?:\s*=\s*(.+))?$', re.IGNORECASE)
+_RE_FOR = re.compile(r'POUR\s+(\w+)\s*=\s*(.+?)\s+_À_\s+(.+)', re.IGNORECASE)
+_RE_IF = re.compile(r'SI\s+(.+?)\s+ALORS', re.IGNORECASE)
+_RE_RETURN = re.compile(r'RENVOYER\s+(.+)', re.IGNORECASE)
+_RE_DIALOG = re.compile(r'Dialogue\s*\((.*)\)', re.IGNORECASE)
+_RE_FUNC_CALL = re.compile(r'(\w+)\s*\((.*)\)')
+_RE_ARRAY = re.compile(r'(\w+)\[(.+?)\]')
+_RE_CHAIN_BASE = re.compile(r'(\w+)')
+_RE_CHAIN_ACCESS = re.compile(r'\[([^\]]+)\]')
+_RE_TABLE_LITERAL = re.compile(r'"([A-Z_]+)"')
+_RE_COMPARISON = re.compile(r'\s+SI\s+.*=.*ALORS|<>|<=|>=', re.IGNORECASE)
+_RE_COMPOUND_OP = re.compile(r'[+\-*/]=')
+_RE_ARG_DELIM = re.compile(r'[,"()\[\]]')
+# Clé de dispatch : mot de tête, coupé au premier caractère non-mot ('SI(a>1)' → 'SI')
+_RE_LEADING_WORD = re.compile(r'\w+')
+# Mots-clés reconnus hors premier mot : une alternation au lieu de N `in`
+# ('EST UN' couvre aussi 'EST UNE')
+_RE_VAR_DECL_KW = re.compile(r'EST UN|est un')
+_RE_DIALOG_KW = re.compile(r'[Dd]ialogue\(')
+# Caractères significatifs d'une expression, relevés en un seul scan
+_RE_EXPR_CHARS = re.compile(r'[\[\]()"+;<>=\-*/]')
+# Concaténation : chaîne (éventuellement non fermée) | '+' | autre texte
+_RE_CONCAT_TOKEN = re.compile(r'"[^"]*"?|\+|[^"+]+')
+_COMPARISON_CHARS = frozenset('<>=')
+_ARITHMETIC_CHARS = frozenset('+-*/')
+
+_NUMBER_FIRST_CHARS = frozenset('.-')
+_BOOLEAN_FIRST_CHARS = frozenset('VFTvft')
+_BOOLEAN_WORDS = frozenset(('VRAI', 'FAUX', 'TRUE', 'FALSE'))
+
+_MISS = object()
+
+# Enfants par défaut des feuilles : tuple vide partagé, jamais muté
+_NO_CHILDREN = ()
+
+# Métadonnées partagées (flyweight) pour les nœuds les plus fréquents.
+# Partagées entre nœuds : à traiter en lecture seule.
+_META_STRING_LITERAL = {"literal_type": "string"}
+_META_NUMBER_LITERAL = {"literal_type": "number"}
+_META_BOOLEAN_LITERAL = {"literal_type": "boolean"}
+_META_GLOBAL = {"is_global": True}
+_META_LOCAL = {"is_global": False}
+_META_DOCUMENTATION = {"is_documentation": True}
+_META_COMMENT = {"is_documentation": False}
+_META_OPERATOR = {
+    op: {"operator": op}
+    for op in ('<>', '<=', '>=', '<', '>', '=', '+', '-', '*', '/', '+=', '-=', '*=', '/=')
+}
+
+
+def _iter_lines(code: str):
+    """Équivalent paresseux de code.split('\\n') (pas de liste intermédiaire)"""
+    start = 0
+    while True:
+        end = code.find('\n', start)
+        if end < 0:
+            yield code[start:]
+            return
+        yield code[start:end]
+        start = end + 1
+
+
 class NodeType(Enum):
     PROGRAM = "Program"
     PROCEDURE = "Procedure"
@@ -27,22 +91,50 @@ class NodeType(Enum):
     ASSOCIATIVE_ARRAY = "AssociativeArray"
     CONCATENATION = "Concatenation"
 
-@dataclass
+# Tags entiers par type de nœud : les parcours comparent des int
+# plutôt que des chaînes (et évitent l'accès NodeType.X.value)
+_TYPE_TO_ID = {t.value: i for i, t in enumerate(NodeType)}
+_PROCEDURE_ID = _TYPE_TO_ID[NodeType.PROCEDURE.value]
+_ASSIGNMENT_ID = _TYPE_TO_ID[NodeType.ASSIGNMENT.value]
+_FUNCTION_CALL_ID = _TYPE_TO_ID[NodeType.FUNCTION_CALL.value]
+_RETURN_STATEMENT_ID = _TYPE_TO_ID[NodeType.RETURN_STATEMENT.value]
+_ARRAY_ACCESS_ID = _TYPE_TO_ID[NodeType.ARRAY_ACCESS.value]
+_CHAIN_ACCESS_ID = _TYPE_TO_ID[NodeType.CHAIN_ACCESS.value]
+_LITERAL_ID = _TYPE_TO_ID[NodeType.LITERAL.value]
+_GLOBAL_VARIABLE_ID = _TYPE_TO_ID[NodeType.GLOBAL_VARIABLE.value]
+_DIALOG_CALL_ID = _TYPE_TO_ID[NodeType.DIALOG_CALL.value]
+
 class ASTNode:
-    type: str
-    value: Optional[Any] = None
-    children: Optional[List['ASTNode']] = None
-    metadata: Optional[Dict[str, Any]] = None
+    # __slots__ : pas de __dict__ par nœud (des milliers par programme)
+    __slots__ = ('type', 'type_id', 'value', 'children', 'metadata')
+
+    def __init__(self, type: str, value: Optional[Any] = None,
+                 children: Sequence['ASTNode'] = _NO_CHILDREN,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.type = type
+        self.type_id = _TYPE_TO_ID.get(type, -1)
+        self.value = value
+        self.children = children
+        self.metadata = metadata
 
     def to_dict(self):
-        result = {"type": self.type}
-        if self.value is not None:
-            result["value"] = self.value
-        if self.children:
-            result["children"] = [child.to_dict() for child in self.children]
-        if self.metadata:
-            result["metadata"] = self.metadata
-        return result
+        """Sérialise le sous-arbre en une boucle (pile explicite, sans récursion)"""
+        root = {}
+        stack = [(self, root)]
+        while stack:
+            node, result = stack.pop()
+            result["type"] = node.type
+            if node.value is not None:
+                result["value"] = node.value
+            if node.children:
+                # Dicts enfants placés tout de suite : l'ordre des clés et
+                # des enfants ne dépend pas de l'ordre de dépilement
+                child_dicts = [{} for _ in node.children]
+                result["children"] = child_dicts
+                stack.extend(zip(node.children, child_dicts))
+            if node.metadata:
+                result["metadata"] = node.metadata
+        return root
 
 class ProcedureAnalyzer:
     """Analyseur enrichi pour les procédures"""
@@ -50,81 +142,78 @@ class ProcedureAnalyzer:
         self.global_reads = set()
         self.global_writes = set()
         self.return_values = []
-        self.api_calls = []
-        self.database_tables = []
+        self.api_calls = set()
+        self.database_tables = set()
         self.dialog_calls = []
-        self.external_functions = []
+        self.external_functions = set()
         
-    def analyze_node(self, node: ASTNode, in_assignment_left: bool = False):
-        """Analyse récursive d'un nœud pour extraire les side effects"""
-        if not node:
-            return
-            
+    def observe(self, node: ASTNode, in_assignment_left: bool = False):
+        """Classe un nœud isolé (sans ses descendants) pour extraire les side effects"""
+        type_id = node.type_id
+
         # Détection des variables globales
-        if node.type == NodeType.GLOBAL_VARIABLE.value:
+        if type_id == _GLOBAL_VARIABLE_ID:
             if in_assignment_left:
                 self.global_writes.add(node.value)
             else:
                 self.global_reads.add(node.value)
-        
+
         # Détection des accès tableau globaux
-        if node.type in [NodeType.ARRAY_ACCESS.value, NodeType.CHAIN_ACCESS.value]:
+        elif type_id == _ARRAY_ACCESS_ID or type_id == _CHAIN_ACCESS_ID:
             if node.metadata and node.metadata.get("is_global"):
                 if in_assignment_left:
                     self.global_writes.add(node.value)
                 else:
                     self.global_reads.add(node.value)
-        
+
         # Détection des retours
-        if node.type == NodeType.RETURN_STATEMENT.value:
+        elif type_id == _RETURN_STATEMENT_ID:
             self.return_values.append({
                 "value": node.value,
                 "type": self._infer_type(node.children[0]) if node.children else "unknown"
             })
-        
+
         # Détection des appels API
-        if node.type == NodeType.FUNCTION_CALL.value:
+        elif type_id == _FUNCTION_CALL_ID:
             if node.metadata and node.metadata.get("is_api_call"):
-                self.api_calls.append(node.value)
+                self.api_calls.add(node.value)
             if node.metadata and node.metadata.get("is_business_function"):
-                self.external_functions.append(node.value)
-        
+                self.external_functions.add(node.value)
+
         # Détection des dialogues
-        if node.type == NodeType.DIALOG_CALL.value:
+        elif type_id == _DIALOG_CALL_ID:
             self.dialog_calls.append({
                 "type": "error" if node.metadata.get("is_error_dialog") else "info"
             })
-        
+
         # Détection des tables de base de données (dans les assignations)
-        if node.type == NodeType.ASSIGNMENT.value:
-            if node.children and len(node.children) == 2:
+        elif type_id == _ASSIGNMENT_ID:
+            if len(node.children) == 2:
                 right = node.children[1]
-                if right.type == NodeType.LITERAL.value and right.metadata.get("literal_type") == "string":
-                    table_match = re.match(r'"([A-Z_]+)"', right.value)
+                if right.type_id == _LITERAL_ID and right.metadata.get("literal_type") == "string":
+                    table_match = _RE_TABLE_LITERAL.match(right.value)
                     if table_match and table_match.group(1).isupper():
-                        self.database_tables.append(table_match.group(1))
-        
-        # Analyse des assignations (côté gauche = écriture)
-        if node.type in [NodeType.ASSIGNMENT.value, NodeType.COMPOUND_ASSIGNMENT.value]:
-            if node.children:
-                self.analyze_node(node.children[0], in_assignment_left=True)
-                if len(node.children) > 1:
-                    self.analyze_node(node.children[1], in_assignment_left=False)
-        else:
-            # Analyse récursive des enfants
-            if node.children:
-                for child in node.children:
-                    self.analyze_node(child, in_assignment_left)
+                        self.database_tables.add(table_match.group(1))
+
+    def merge(self, other: 'ProcedureAnalyzer'):
+        """Intègre les résultats d'un autre analyseur (procédure imbriquée)"""
+        self.global_reads |= other.global_reads
+        self.global_writes |= other.global_writes
+        self.return_values.extend(other.return_values)
+        self.api_calls |= other.api_calls
+        self.database_tables |= other.database_tables
+        self.dialog_calls.extend(other.dialog_calls)
+        self.external_functions |= other.external_functions
     
     def _infer_type(self, node: ASTNode) -> str:
         """Infère le type d'une expression"""
         if not node:
             return "unknown"
         
-        if node.type == NodeType.LITERAL.value:
+        if node.type_id == _LITERAL_ID:
             return node.metadata.get("literal_type", "unknown")
         
-        if node.type == NodeType.FUNCTION_CALL.value:
+        if node.type_id == _FUNCTION_CALL_ID:
             # Heuristiques basées sur le nom de la fonction
             func_name = node.value.lower()
             if "date" in func_name:
@@ -153,19 +242,19 @@ class ProcedureAnalyzer:
         return {
             "inputs": {
                 "parameters": [],  # À remplir par le parser
-                "global_dependencies": sorted(list(self.global_reads))
+                "global_dependencies": sorted(self.global_reads)
             },
             "outputs": {
                 "return_type": return_type,
                 "return_values": return_values_unique,
                 "return_count": len(self.return_values),
-                "global_modifications": sorted(list(self.global_writes))
+                "global_modifications": sorted(self.global_writes)
             },
             "side_effects": {
-                "api_calls": sorted(list(set(self.api_calls))),
-                "database_operations": sorted(list(set(self.database_tables))),
+                "api_calls": sorted(self.api_calls),
+                "database_operations": sorted(self.database_tables),
                 "dialogs": len(self.dialog_calls),
-                "external_functions": sorted(list(set(self.external_functions)))
+                "external_functions": sorted(self.external_functions)
             },
             "complexity": {
                 "global_reads": len(self.global_reads),
@@ -175,13 +264,32 @@ class ProcedureAnalyzer:
         }
 
 class WinDevParser:
+    # Dispatch sur le premier mot (en majuscules) de l'instruction
+    _DISPATCH = {
+        'PROCÉDURE': lambda self, line: self.parse_procedure(),
+        'PROCEDURE': lambda self, line: self.parse_procedure(),
+        'POUR': lambda self, line: self.parse_for_loop(),
+        'SI': lambda self, line: self.parse_if_statement(),
+        'RENVOYER': lambda self, line: self.parse_return_statement(line),
+        'SORTIR': lambda self, line: ASTNode(type=NodeType.BREAK_STATEMENT.value, value="SORTIR"),
+    }
+
     def __init__(self, code: str):
         self.code = code
-        self.lines = code.split('\n')
+        # Versions strip()/upper() calculées une seule fois par ligne ;
+        # les lignes brutes ne sont pas conservées
+        self.stripped_lines = [l.strip() for l in _iter_lines(code)]
+        self.upper_lines = [l.upper() for l in self.stripped_lines]
         self.current_line = 0
         self.global_variables = set()
         self.local_variables = set()
         self.functions_called = set()
+        # Analyse fusionnée au parsing : l'analyseur de la procédure en cours
+        # observe chaque nœud à sa création (plus de second parcours)
+        self._analyzer: Optional[ProcedureAnalyzer] = None
+        self._in_assignment_left = False
+        # Mémo des sous-expressions : le nœud produit ne dépend que du texte
+        self._expr_cache: Dict[str, Optional[ASTNode]] = {}
 
     def parse(self) -> ASTNode:
         """Point d'entrée principal pour l'analyse"""
@@ -189,59 +297,49 @@ class WinDevParser:
             type=NodeType.PROGRAM.value,
             children=[],
             metadata={
-                "total_lines": len(self.lines),
+                "total_lines": len(self.stripped_lines),
                 "global_variables": [],
                 "functions_called": [],
                 "procedures_count": 0
             }
         )
 
-        while self.current_line < len(self.lines):
+        while self.current_line < len(self.stripped_lines):
             node = self.parse_statement()
             if node:
                 root.children.append(node)
             self.current_line += 1
 
-        root.metadata["global_variables"] = sorted(list(self.global_variables))
-        root.metadata["functions_called"] = sorted(list(self.functions_called))
+        root.metadata["global_variables"] = sorted(self.global_variables)
+        root.metadata["functions_called"] = sorted(self.functions_called)
         root.metadata["procedures_count"] = sum(
-            1 for child in root.children if child.type == NodeType.PROCEDURE.value
+            1 for child in root.children if child.type_id == _PROCEDURE_ID
         )
 
         return root
 
     def parse_statement(self) -> Optional[ASTNode]:
         """Parse une instruction WinDev"""
-        line = self.lines[self.current_line].strip()
+        line = self.stripped_lines[self.current_line]
 
         if not line or line.startswith('//'):
             return self.parse_comment(line)
 
-        if line.upper().startswith('PROCÉDURE') or line.upper().startswith('PROCEDURE'):
-            return self.parse_procedure()
+        keyword = _RE_LEADING_WORD.match(self.upper_lines[self.current_line])
+        handler = self._DISPATCH.get(keyword.group()) if keyword else None
+        if handler:
+            return handler(self, line)
 
         if self.is_variable_declaration(line):
             return self.parse_variable_declaration(line)
 
-        if line.upper().startswith('POUR'):
-            return self.parse_for_loop()
-
-        if line.upper().startswith('SI'):
-            return self.parse_if_statement()
-
-        if line.upper().startswith('RENVOYER'):
-            return self.parse_return_statement(line)
-
-        if line.upper() == 'SORTIR':
-            return ASTNode(type=NodeType.BREAK_STATEMENT.value, value="SORTIR")
-
-        if '+=' in line or '-=' in line or '*=' in line or '/=' in line:
+        if _RE_COMPOUND_OP.search(line):
             return self.parse_compound_assignment(line)
 
         if '=' in line and not self.is_comparison(line):
             return self.parse_assignment(line)
 
-        if 'Dialogue(' in line or 'dialogue(' in line:
+        if _RE_DIALOG_KW.search(line):
             return self.parse_dialog_call(line)
 
         if '(' in line and ')' in line:
@@ -249,16 +347,15 @@ class WinDevParser:
 
         return None
 
+    def _observe(self, node: Optional[ASTNode]) -> Optional[ASTNode]:
+        """Transmet un nœud fraîchement construit à l'analyseur actif"""
+        if node is not None and self._analyzer is not None:
+            self._analyzer.observe(node, self._in_assignment_left)
+        return node
+
     def is_comparison(self, line: str) -> bool:
         """Vérifie si le '=' est une comparaison et non une assignation"""
-        comparison_patterns = [
-            r'\s+SI\s+.*=.*ALORS',
-            r'<>',
-            r'<=',
-            r'>='
-        ]
-        line_upper = line.upper()
-        return any(re.search(pattern, line_upper, re.IGNORECASE) for pattern in comparison_patterns)
+        return _RE_COMPARISON.search(line.upper()) is not None
 
     def parse_comment(self, line: str) -> ASTNode:
         """Parse un commentaire"""
@@ -268,13 +365,13 @@ class WinDevParser:
         return ASTNode(
             type=NodeType.COMMENT.value,
             value=content,
-            metadata={"is_documentation": is_summary}
+            metadata=_META_DOCUMENTATION if is_summary else _META_COMMENT
         )
 
     def parse_procedure(self) -> ASTNode:
         """Parse une déclaration de procédure avec analyse enrichie"""
-        line = self.lines[self.current_line]
-        match = re.search(r'PROC[ÉE]DURE\s+(\w+)\s*\((.*?)\)', line, re.IGNORECASE)
+        line = self.stripped_lines[self.current_line]
+        match = _RE_PROC.search(line)
 
         if match:
             proc_name = match.group(1)
@@ -288,14 +385,18 @@ class WinDevParser:
             for param in params:
                 self.local_variables.add(param)
 
+            outer_analyzer = self._analyzer
+            analyzer = ProcedureAnalyzer()
+            self._analyzer = analyzer
+
             body = []
             self.current_line += 1
 
-            while self.current_line < len(self.lines):
-                line_content = self.lines[self.current_line].strip()
+            while self.current_line < len(self.stripped_lines):
+                line_content = self.upper_lines[self.current_line]
 
-                if line_content.upper().startswith('PROCÉDURE') or \
-                   line_content.upper().startswith('PROCEDURE'):
+                if line_content.startswith('PROCÉDURE') or \
+                   line_content.startswith('PROCEDURE'):
                     self.current_line -= 1
                     break
 
@@ -305,10 +406,10 @@ class WinDevParser:
 
                 self.current_line += 1
 
-            # Analyse enrichie de la procédure
-            analyzer = ProcedureAnalyzer()
-            for node in body:
-                analyzer.analyze_node(node)
+            # Analyse enrichie de la procédure (déjà collectée pendant le parsing)
+            self._analyzer = outer_analyzer
+            if outer_analyzer is not None:
+                outer_analyzer.merge(analyzer)
             
             analysis = analyzer.get_summary()
             analysis["inputs"]["parameters"] = params
@@ -332,12 +433,11 @@ class WinDevParser:
 
     def is_variable_declaration(self, line: str) -> bool:
         """Vérifie si la ligne est une déclaration de variable"""
-        keywords = ['EST UNE', 'EST UN', 'est une', 'est un']
-        return any(kw in line for kw in keywords)
+        return _RE_VAR_DECL_KW.search(line) is not None
 
     def parse_variable_declaration(self, line: str) -> ASTNode:
         """Parse une déclaration de variable avec initial_value parsé"""
-        match = re.search(r'(\w+)\s+est\s+un(?:e)?\s+([\w\s<>]+?)(?:\s*=\s*(.+))?$', line, re.IGNORECASE)
+        match = _RE_VAR_DECL.search(line)
 
         if match:
             var_name = match.group(1)
@@ -388,13 +488,12 @@ class WinDevParser:
                     left = parts[0].strip()
                     right = parts[1].strip()
 
-                    left_node = self.parse_expression(left)
-                    right_node = self.parse_expression(right)
+                    left_node, right_node = self._parse_assignment_sides(left, right)
 
                     return ASTNode(
                         type=NodeType.COMPOUND_ASSIGNMENT.value,
                         children=[left_node, right_node],
-                        metadata={"operator": op}
+                        metadata=_META_OPERATOR[op]
                     )
         return None
 
@@ -405,21 +504,30 @@ class WinDevParser:
             left = parts[0].strip()
             right = parts[1].strip()
 
-            left_node = self.parse_expression(left)
-            right_node = self.parse_expression(right)
+            left_node, right_node = self._parse_assignment_sides(left, right)
 
-            return ASTNode(
+            return self._observe(ASTNode(
                 type=NodeType.ASSIGNMENT.value,
                 children=[left_node, right_node],
-                metadata={"operator": "="}
-            )
+                metadata=_META_OPERATOR["="]
+            ))
 
         return None
 
+    def _parse_assignment_sides(self, left: str, right: str):
+        """Parse les deux côtés d'une assignation (côté gauche = écriture)"""
+        saved_flag = self._in_assignment_left
+        self._in_assignment_left = True
+        left_node = self.parse_expression(left)
+        self._in_assignment_left = False
+        right_node = self.parse_expression(right)
+        self._in_assignment_left = saved_flag
+        return left_node, right_node
+
     def parse_for_loop(self) -> ASTNode:
         """Parse une boucle FOR"""
-        line = self.lines[self.current_line]
-        match = re.search(r'POUR\s+(\w+)\s*=\s*(.+?)\s+_À_\s+(.+)', line, re.IGNORECASE)
+        line = self.stripped_lines[self.current_line]
+        match = _RE_FOR.search(line)
 
         body = []
         if match:
@@ -429,8 +537,8 @@ class WinDevParser:
 
             self.current_line += 1
 
-            while self.current_line < len(self.lines):
-                line_content = self.lines[self.current_line].strip().upper()
+            while self.current_line < len(self.stripped_lines):
+                line_content = self.upper_lines[self.current_line]
 
                 if line_content == 'FIN':
                     break
@@ -456,8 +564,8 @@ class WinDevParser:
 
     def parse_if_statement(self) -> ASTNode:
         """Parse une structure IF"""
-        line = self.lines[self.current_line]
-        match = re.search(r'SI\s+(.+?)\s+ALORS', line, re.IGNORECASE)
+        line = self.stripped_lines[self.current_line]
+        match = _RE_IF.search(line)
 
         if match:
             condition = match.group(1).strip()
@@ -467,8 +575,8 @@ class WinDevParser:
 
             self.current_line += 1
 
-            while self.current_line < len(self.lines):
-                line_content = self.lines[self.current_line].strip().upper()
+            while self.current_line < len(self.stripped_lines):
+                line_content = self.upper_lines[self.current_line]
 
                 if line_content == 'FIN':
                     break
@@ -510,21 +618,21 @@ class WinDevParser:
 
     def parse_return_statement(self, line: str) -> ASTNode:
         """Parse un RENVOYER"""
-        match = re.search(r'RENVOYER\s+(.+)', line, re.IGNORECASE)
+        match = _RE_RETURN.search(line)
 
         if match:
             return_value = match.group(1).strip()
-            return ASTNode(
+            return self._observe(ASTNode(
                 type=NodeType.RETURN_STATEMENT.value,
                 value=return_value,
                 children=[self.parse_expression(return_value)]
-            )
+            ))
 
         return None
 
     def parse_dialog_call(self, line: str) -> ASTNode:
         """Parse un appel Dialogue()"""
-        match = re.search(r'Dialogue\s*\((.*)\)', line, re.IGNORECASE)
+        match = _RE_DIALOG.search(line)
         
         if match:
             args_str = match.group(1)
@@ -535,7 +643,7 @@ class WinDevParser:
             
             self.functions_called.add("Dialogue")
             
-            return ASTNode(
+            return self._observe(ASTNode(
                 type=NodeType.DIALOG_CALL.value,
                 value="Dialogue",
                 children=args,
@@ -543,13 +651,13 @@ class WinDevParser:
                     "argument_count": len(args),
                     "is_error_dialog": "dlgIcôneErreur" in line or "Erreur" in line
                 }
-            )
+            ))
         
         return None
 
     def parse_function_call(self, line: str) -> ASTNode:
         """Parse un appel de fonction"""
-        match = re.search(r'(\w+)\s*\((.*)\)', line)
+        match = _RE_FUNC_CALL.search(line)
 
         if match:
             func_name = match.group(1)
@@ -565,7 +673,7 @@ class WinDevParser:
             is_api_call = func_name.startswith('_api') or 'api' in func_name.lower()
             is_business_function = func_name.startswith('_') or func_name.startswith('fct')
 
-            return ASTNode(
+            return self._observe(ASTNode(
                 type=NodeType.FUNCTION_CALL.value,
                 value=func_name,
                 children=args,
@@ -574,40 +682,83 @@ class WinDevParser:
                     "is_api_call": is_api_call,
                     "is_business_function": is_business_function
                 }
-            )
+            ))
 
         return None
 
     def parse_expression(self, expr: str) -> ASTNode:
-        """Parse une expression"""
+        """Parse une expression (mémoïsée par texte)"""
         expr = expr.strip()
+        cached = self._expr_cache.get(expr, _MISS)
+        if cached is not _MISS:
+            self._replay_expression(cached)
+            return cached
+
+        node = self._parse_expression(expr)
+        self._expr_cache[expr] = node
+        return node
+
+    def _replay_expression(self, node: Optional[ASTNode]):
+        """
+        Rejoue les effets de bord d'un sous-arbre mémoïsé : variables
+        globales, fonctions appelées et observation par l'analyseur actif
+        """
+        analyzer = self._analyzer
+        in_assignment_left = self._in_assignment_left
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            type_id = node.type_id
+            if type_id == _GLOBAL_VARIABLE_ID:
+                self.global_variables.add(node.value)
+            elif type_id == _ARRAY_ACCESS_ID or type_id == _CHAIN_ACCESS_ID:
+                if node.metadata.get("is_global"):
+                    self.global_variables.add(node.value)
+            elif type_id == _FUNCTION_CALL_ID:
+                self.functions_called.add(node.value)
+            if analyzer is not None:
+                analyzer.observe(node, in_assignment_left)
+            stack.extend(node.children)
+
+    def _parse_expression(self, expr: str) -> ASTNode:
+        """Parse une expression (texte déjà nettoyé)"""
+        first = expr[:1]
+
+        # Littéraux : aiguillage sur le premier caractère
+        if first == '"':
+            if expr.endswith('"'):
+                return ASTNode(
+                    type=NodeType.LITERAL.value,
+                    value=expr,
+                    metadata=_META_STRING_LITERAL
+                )
+        elif first.isdigit() or first in _NUMBER_FIRST_CHARS:
+            if expr.replace('.', '', 1).replace('-', '', 1).isdigit():
+                return ASTNode(
+                    type=NodeType.LITERAL.value,
+                    value=expr,
+                    metadata=_META_NUMBER_LITERAL
+                )
+        elif first in _BOOLEAN_FIRST_CHARS:
+            if expr.upper() in _BOOLEAN_WORDS:
+                return ASTNode(
+                    type=NodeType.LITERAL.value,
+                    value=expr,
+                    metadata=_META_BOOLEAN_LITERAL
+                )
 
-        if expr.startswith('"') and expr.endswith('"'):
-            return ASTNode(
-                type=NodeType.LITERAL.value,
-                value=expr,
-                metadata={"literal_type": "string"}
-            )
-
-        if expr.replace('.', '', 1).replace('-', '', 1).isdigit():
-            return ASTNode(
-                type=NodeType.LITERAL.value,
-                value=expr,
-                metadata={"literal_type": "number"}
-            )
-
-        if expr.upper() in ['VRAI', 'FAUX', 'TRUE', 'FALSE']:
-            return ASTNode(
-                type=NodeType.LITERAL.value,
-                value=expr,
-                metadata={"literal_type": "boolean"}
-            )
+        # Un seul scan C remplace les tests `in` successifs sur expr
+        chars = set(_RE_EXPR_CHARS.findall(expr))
+        has_bracket = '[' in chars
+        has_paren = '(' in chars
 
-        if self.is_chain_access(expr):
+        if has_bracket and self.is_chain_access(expr):
             return self.parse_chain_access(expr)
 
-        if '[' in expr and ']' in expr and '(' not in expr:
-            match = re.search(r'(\w+)\[(.+?)\]', expr)
+        if has_bracket and ']' in chars and not has_paren:
+            match = _RE_ARRAY.search(expr)
             if match:
                 array_name = match.group(1)
                 index = match.group(2)
@@ -616,7 +767,7 @@ class WinDevParser:
                 if is_global:
                     self.global_variables.add(array_name)
 
-                return ASTNode(
+                return self._observe(ASTNode(
                     type=NodeType.ARRAY_ACCESS.value,
                     value=array_name,
                     children=[self.parse_expression(index)],
@@ -624,49 +775,51 @@ class WinDevParser:
                         "index": index,
                         "is_global": is_global
                     }
-                )
+                ))
 
-        if '(' in expr and ')' in expr:
+        if has_paren and ')' in chars:
             return self.parse_function_call(expr)
 
-        if '+' in expr and ('"' in expr or any(op in expr for op in [';'])):
+        if '+' in chars and ('"' in chars or ';' in chars):
             return self.parse_concatenation(expr)
 
-        for op in ['<>', '<=', '>=', '<', '>', '=']:
-            if op in expr and not (expr.startswith('"') and expr.endswith('"')):
-                parts = expr.split(op, 1)
-                if len(parts) == 2:
+        # Les opérateurs sont essayés par priorité (pas le plus à gauche) ;
+        # le cas courant sans opérateur est écarté par le relevé ci-dessus
+        if not chars.isdisjoint(_COMPARISON_CHARS):
+            for op in ['<>', '<=', '>=', '<', '>', '=']:
+                if op in expr:
+                    parts = expr.split(op, 1)
                     return ASTNode(
                         type=NodeType.BINARY_OPERATION.value,
                         children=[
                             self.parse_expression(parts[0].strip()),
                             self.parse_expression(parts[1].strip())
                         ],
-                        metadata={"operator": op}
+                        metadata=_META_OPERATOR[op]
                     )
 
-        for op in ['+', '-', '*', '/']:
-            if op in expr:
-                parts = expr.split(op, 1)
-                if len(parts) == 2:
+        if not chars.isdisjoint(_ARITHMETIC_CHARS):
+            for op in ['+', '-', '*', '/']:
+                if op in expr:
+                    parts = expr.split(op, 1)
                     return ASTNode(
                         type=NodeType.BINARY_OPERATION.value,
                         children=[
                             self.parse_expression(parts[0].strip()),
                             self.parse_expression(parts[1].strip())
                         ],
-                        metadata={"operator": op}
+                        metadata=_META_OPERATOR[op]
                     )
 
         is_global = expr.startswith('g')
         if is_global:
             self.global_variables.add(expr)
 
-        return ASTNode(
+        return self._observe(ASTNode(
             type=NodeType.GLOBAL_VARIABLE.value if is_global else NodeType.IDENTIFIER.value,
             value=expr,
-            metadata={"is_global": is_global}
-        )
+            metadata=_META_GLOBAL if is_global else _META_LOCAL
+        ))
 
     def is_chain_access(self, expr: str) -> bool:
         """Vérifie si c'est un accès chaîné"""
@@ -684,13 +837,13 @@ class WinDevParser:
 
     def parse_chain_access(self, expr: str) -> ASTNode:
         """Parse un accès chaîné: gProduit[i]["IDProduit"]"""
-        base_match = re.match(r'(\w+)', expr)
+        base_match = _RE_CHAIN_BASE.match(expr)
         if not base_match:
             return self.parse_expression(expr)
 
         base_name = base_match.group(1)
         
-        accesses = re.findall(r'\[([^\]]+)\]', expr)
+        accesses = _RE_CHAIN_ACCESS.findall(expr)
         
         children = [self.parse_expression(access) for access in accesses]
         
@@ -698,7 +851,7 @@ class WinDevParser:
         if is_global:
             self.global_variables.add(base_name)
         
-        return ASTNode(
+        return self._observe(ASTNode(
             type=NodeType.CHAIN_ACCESS.value,
             value=base_name,
             children=children,
@@ -707,27 +860,27 @@ class WinDevParser:
                 "depth": len(accesses),
                 "is_global": is_global
             }
-        )
+        ))
 
     def parse_concatenation(self, expr: str) -> ASTNode:
         """Parse une concaténation de chaînes"""
         parts = []
-        current = ""
-        in_string = False
+        current = []
         
-        for char in expr:
-            if char == '"':
-                in_string = not in_string
-                current += char
-            elif char == '+' and not in_string:
-                if current.strip():
-                    parts.append(current.strip())
-                current = ""
+        # Tokenisation par le moteur regex : les '+' dans une chaîne
+        # font partie du token chaîne et ne séparent pas
+        for token in _RE_CONCAT_TOKEN.findall(expr):
+            if token == '+':
+                part = "".join(current).strip()
+                if part:
+                    parts.append(part)
+                current = []
             else:
-                current += char
+                current.append(token)
         
-        if current.strip():
-            parts.append(current.strip())
+        part = "".join(current).strip()
+        if part:
+            parts.append(part)
         
         if len(parts) > 1:
             children = [self.parse_expression(part) for part in parts]
@@ -742,38 +895,47 @@ class WinDevParser:
     def split_arguments(self, args_str: str) -> List[str]:
         """Sépare les arguments en tenant compte des parenthèses et guillemets"""
         args = []
-        current_arg = ""
+        start = 0
+        pos = 0
         paren_depth = 0
         bracket_depth = 0
         in_string = False
 
-        for char in args_str:
-            if char == '"':
-                in_string = not in_string
-                current_arg += char
-            elif not in_string:
-                if char == '(':
-                    paren_depth += 1
-                    current_arg += char
-                elif char == ')':
-                    paren_depth -= 1
-                    current_arg += char
-                elif char == '[':
-                    bracket_depth += 1
-                    current_arg += char
-                elif char == ']':
-                    bracket_depth -= 1
-                    current_arg += char
-                elif char == ',' and paren_depth == 0 and bracket_depth == 0:
-                    args.append(current_arg.strip())
-                    current_arg = ""
-                else:
-                    current_arg += char
-            else:
-                current_arg += char
+        # Saut direct au prochain délimiteur (recherche C) au lieu d'une
+        # boucle Python caractère par caractère
+        while True:
+            if in_string:
+                i = args_str.find('"', pos)
+                if i < 0:
+                    break
+                in_string = False
+                pos = i + 1
+                continue
 
-        if current_arg.strip():
-            args.append(current_arg.strip())
+            match = _RE_ARG_DELIM.search(args_str, pos)
+            if not match:
+                break
+            i = match.start()
+            char = args_str[i]
+
+            if char == '"':
+                in_string = True
+            elif char == '(':
+                paren_depth += 1
+            elif char == ')':
+                paren_depth -= 1
+            elif char == '[':
+                bracket_depth += 1
+            elif char == ']':
+                bracket_depth -= 1
+            elif paren_depth == 0 and bracket_depth == 0:
+                args.append(args_str[start:i].strip())
+                start = i + 1
+            pos = i + 1
+
+        last_arg = args_str[start:].strip()
+        if last_arg:
+            args.append(last_arg)
 
         return args
 
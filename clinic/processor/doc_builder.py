@@ -11,12 +11,17 @@ from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.table import WD_ALIGN_VERTICAL
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
-import base64
 import io
 import tempfile
 import logging
 from typing import Dict, List, Any, Optional
 
+try:
+    # Décodeur SIMD, même API que base64 (logigrammes de plusieurs Mo)
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+
 logger = logging.getLogger(__name__)
 
 # ── Palette CIH Bank (extraite du document de référence) ─────────────────────
@@ -28,6 +33,18 @@ BLACK         = RGBColor(0, 0, 0)
 BORDER_LIGHT  = 'E7E6E6'                 # bordures tableau header
 BORDER_TABLE  = 'A6A6A6'                 # bordures tableaux opérations
 
+# ── Libellés fixes (construits une fois) ─────────────────────────────────────
+HEADER_FIELDS = (
+    ("Version : ", 'version'),
+    ("Date de prise d'effet : ", 'dateEffet'),
+    ("Date diffusion : ", 'dateDiffusion'),
+)
+INDICATOR_FIELDS = (
+    ("Durée estimée : ", 'duree_estimee'),
+    ("Fréquence : ", 'frequence'),
+    ("KPI : ", 'kpi'),
+)
+
 
 def _set_cell_bg(cell, hex_color: str):
     tc = cell._tc
@@ -74,27 +91,44 @@ def _set_table_borders(table, color=BORDER_TABLE, sz=4):
     tblPr.append(tblBorders)
 
 
-def _set_col_width(table, col_idx: int, width_cm: float):
+def _set_col_widths(table, widths_cm: List[float]):
+    """Largeur de chaque colonne, en un seul parcours des lignes."""
+    widths_dxa = [str(int(width_cm * 567)) for width_cm in widths_cm]
     for row in table.rows:
-        cell = row.cells[col_idx]
-        tc = cell._tc
-        tcPr = tc.get_or_add_tcPr()
-        tcW = tcPr.find(qn('w:tcW'))
-        if tcW is None:
-            tcW = OxmlElement('w:tcW')
-            tcPr.append(tcW)
-        tcW.set(qn('w:w'), str(int(width_cm * 567)))
-        tcW.set(qn('w:type'), 'dxa')
+        for cell, width_dxa in zip(row.cells, widths_dxa):
+            tcPr = cell._tc.get_or_add_tcPr()
+            tcW = tcPr.find(qn('w:tcW'))
+            if tcW is None:
+                tcW = OxmlElement('w:tcW')
+                tcPr.append(tcW)
+            tcW.set(qn('w:w'), width_dxa)
+            tcW.set(qn('w:type'), 'dxa')
+
+
+def _add_centered_picture(doc, image_base64: str, width) -> int:
+    """Décode une image base64 (data URI ou brute) et l'insère centrée ; renvoie sa taille."""
+    if image_base64.startswith('data:image'):
+        image_base64 = image_base64.split(',', 1)[1]
+    image_data = b64decode(image_base64)
+    p = doc.add_paragraph()
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    p.add_run().add_picture(io.BytesIO(image_data), width=width)
+    return len(image_data)
 
 
 def _run(paragraph, text, bold=False, size=10, color=None, italic=False, name='Calibri'):
     r = paragraph.add_run(text)
-    r.font.name = name
-    r.font.size = Pt(size)
-    r.font.bold = bold
-    r.font.italic = italic
+    font = r.font
+    font.name = name
+    font.size = Pt(size)
+    # Gras/italique écrits seulement s'ils sont actifs : aucun style de paragraphe
+    # utilisé avec bold=False/italic=False ne les active, un <w:b w:val="0"/> par run est inutile
+    if bold:
+        font.bold = True
+    if italic:
+        font.italic = True
     if color:
-        r.font.color.rgb = color
+        font.color.rgb = color
     return r
 
 
@@ -104,6 +138,9 @@ class DocumentBuilder:
     Structure : Header table → Généralités → Sommaire → 1. Description procédure
     """
 
+    # Types d'étape dont la 2e ligne du tableau opération s'intitule "Commentaire"
+    _COMMENT_TYPES = frozenset(('ExclusiveGateway', 'StartEvent', 'EndEvent'))
+
     def __init__(self):
         self.doc = Document()
         self.step_id_to_name: Dict[str, str] = {}
@@ -224,8 +261,7 @@ class DocumentBuilder:
         table.style = 'Table Grid'
         _set_table_borders(table, color=BORDER_LIGHT, sz=4)
 
-        cell_left  = table.cell(0, 0)
-        cell_right = table.cell(0, 1)
+        cell_left, cell_right = table.rows[0].cells
 
         # Colonne gauche : "Procédure" en gris/cyan + titre en gras noir
         p_proc = cell_left.paragraphs[0]
@@ -240,18 +276,13 @@ class DocumentBuilder:
         p_ref = cell_right.paragraphs[0]
         _run(p_ref, f"Réf : {metadata.get('ref', '')}", size=9)
 
-        for label, key in [
-            ("Version : ", 'version'),
-            ("Date de prise d'effet : ", 'dateEffet'),
-            ("Date diffusion : ", 'dateDiffusion'),
-        ]:
+        for label, key in HEADER_FIELDS:
             p = cell_right.add_paragraph()
             _run(p, f"{label}{metadata.get(key, '')}", size=9)
 
         # Largeurs : 60% / 40%
         total_cm = 16.0
-        _set_col_width(table, 0, total_cm * 0.60)
-        _set_col_width(table, 1, total_cm * 0.40)
+        _set_col_widths(table, [total_cm * 0.60, total_cm * 0.40])
 
         self.doc.add_paragraph()
 
@@ -274,17 +305,11 @@ class DocumentBuilder:
         internes = metadata.get('responsabilites_internes', [])
         externes = metadata.get('responsabilites_externes', [])
         if internes:
-            bp = self.doc.add_paragraph(style='List Bullet')
-            _run(bp, "Internes")
-            for actor in internes:
-                sp = self.doc.add_paragraph(style='List Bullet 2')
-                _run(sp, actor)
+            self._add_bullets(["Internes"])
+            self._add_bullets(internes, 'List Bullet 2')
         if externes:
-            bp = self.doc.add_paragraph(style='List Bullet')
-            _run(bp, "Externes")
-            for actor in externes:
-                sp = self.doc.add_paragraph(style='List Bullet 2')
-                _run(sp, actor)
+            self._add_bullets(["Externes"])
+            self._add_bullets(externes, 'List Bullet 2')
         if not internes and not externes:
             self.doc.add_paragraph()
 
@@ -292,9 +317,7 @@ class DocumentBuilder:
         references = metadata.get('references', '')
         if references:
             if isinstance(references, list):
-                for ref in references:
-                    bp = self.doc.add_paragraph(style='List Bullet')
-                    _run(bp, ref)
+                self._add_bullets(references)
             else:
                 self.doc.add_paragraph(references)
         else:
@@ -356,9 +379,7 @@ class DocumentBuilder:
         regles = metadata.get('regles_gestion', '')
         if regles:
             if isinstance(regles, list):
-                for regle in regles:
-                    bp = self.doc.add_paragraph(style='List Bullet')
-                    _run(bp, regle)
+                self._add_bullets(regles)
             else:
                 for line in regles.split('\n'):
                     line = line.strip()
@@ -372,12 +393,8 @@ class DocumentBuilder:
     def _add_logigramme(self, diagram_base64: str):
         self._add_h2("1.2 Logigramme")
         try:
-            b64 = diagram_base64.split(',')[1] if diagram_base64.startswith('data:image') else diagram_base64
-            image_data = base64.b64decode(b64)
-            p = self.doc.add_paragraph()
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            p.add_run().add_picture(io.BytesIO(image_data), width=Inches(6.3))
-            logger.info(f"✅ Logigramme inséré ({len(image_data)} bytes)")
+            size = _add_centered_picture(self.doc, diagram_base64, Inches(6.3))
+            logger.info(f"✅ Logigramme inséré ({size} bytes)")
         except Exception as e:
             logger.error(f"❌ Erreur logigramme : {e}")
             p = self.doc.add_paragraph()
@@ -395,15 +412,20 @@ class DocumentBuilder:
     def _add_description_operations(self, workflow, enrichments, options):
         self._add_h2("1.3 Description des opérations")
 
-        op_number = 0
-        for step in workflow:
-            op_number += 1
-            enrichment = enrichments.get(step['id']) if options.get('include_enrichments') else None
-            self._add_operation_block(step, enrichment, op_number)
+        include_enrichments = options.get('include_enrichments')
+        # Style des puces résolu une fois pour toutes les opérations (recherche par nom dans styles.xml)
+        try:
+            bullet_style = self.doc.styles['List Bullet']
+        except KeyError:
+            bullet_style = None
+
+        for op_number, step in enumerate(workflow, 1):
+            enrichment = enrichments.get(step['id']) if include_enrichments else None
+            self._add_operation_block(step, enrichment, op_number, bullet_style)
 
-        logger.info(f"✅ {op_number} opérations documentées")
+        logger.info(f"✅ {len(workflow)} opérations documentées")
 
-    def _add_operation_block(self, step, enrichment, number):
+    def _add_operation_block(self, step, enrichment, number, bullet_style=None):
         """
         Format CIH Bank :
         Numéro. Titre (gras)
@@ -432,9 +454,10 @@ class DocumentBuilder:
         table.style = 'Table Grid'
         _set_table_borders(table, color=BORDER_TABLE, sz=4)
 
+        # Cellules lues ligne par ligne : table.cell() reconstruit toute la grille à chaque appel
+        (c_lbl_a, c_val_a), (c_lbl_d, c_val_d) = [row.cells for row in table.rows]
+
         # Ligne 1 — Acteur
-        c_lbl_a = table.cell(0, 0)
-        c_val_a = table.cell(0, 1)
         _set_cell_bg(c_lbl_a, 'F2F2F2')
 
         p_al = c_lbl_a.paragraphs[0]
@@ -446,13 +469,11 @@ class DocumentBuilder:
         _run(p_av, f"{acteur} - {dept}" if dept else acteur)
 
         # Ligne 2 — Description / Commentaire
-        c_lbl_d = table.cell(1, 0)
-        c_val_d = table.cell(1, 1)
         _set_cell_bg(c_lbl_d, 'F2F2F2')
         c_lbl_d.vertical_alignment = WD_ALIGN_VERTICAL.TOP
         c_val_d.vertical_alignment = WD_ALIGN_VERTICAL.TOP
 
-        label_desc = "Commentaire :" if step['typeBpmn'] in ['ExclusiveGateway', 'StartEvent', 'EndEvent'] else "Description :"
+        label_desc = "Commentaire :" if step['typeBpmn'] in self._COMMENT_TYPES else "Description :"
         _run(c_lbl_d.paragraphs[0], label_desc, bold=True)
 
         desc_lines = self._build_description(step, enrichment)
@@ -461,18 +482,15 @@ class DocumentBuilder:
             p = c_val_d.paragraphs[0] if first else c_val_d.add_paragraph()
             first = False
             if line.startswith('• '):
-                try:
-                    p.style = self.doc.styles['List Bullet']
-                except Exception:
-                    pass
+                if bullet_style is not None:
+                    p.style = bullet_style
                 _run(p, line[2:])
             else:
                 _run(p, line)
 
         # Largeurs 22% / 78%
         total_cm = 16.0
-        _set_col_width(table, 0, total_cm * 0.22)
-        _set_col_width(table, 1, total_cm * 0.78)
+        _set_col_widths(table, [total_cm * 0.22, total_cm * 0.78])
 
         # Applicatif
         outil = step.get('outil', '').strip() or (enrichment.get('applicatif', '').strip() if enrichment else '')
@@ -483,7 +501,7 @@ class DocumentBuilder:
 
         # Indicateurs (durée / fréquence / KPI) — hors du champ Description
         if enrichment:
-            for label, key in [("Durée estimée : ", 'duree_estimee'), ("Fréquence : ", 'frequence'), ("KPI : ", 'kpi')]:
+            for label, key in INDICATOR_FIELDS:
                 value = enrichment.get(key)
                 if value:
                     p_ind = self.doc.add_paragraph()
@@ -506,10 +524,13 @@ class DocumentBuilder:
             condition = step.get('condition', '')
             if condition and not lines:
                 lines.append(f"Point de décision : {condition}")
+            step_names = self.step_id_to_name
             for out in step.get('outputs', []):
-                label     = out.get('label', '')     if isinstance(out, dict) else out.label
-                target_id = out.get('targetId', '')  if isinstance(out, dict) else out.targetId
-                target_name = self.step_id_to_name.get(target_id, target_id)
+                if isinstance(out, dict):
+                    label, target_id = out.get('label', ''), out.get('targetId', '')
+                else:
+                    label, target_id = out.label, out.targetId
+                target_name = step_names.get(target_id, target_id)
                 if label and target_name:
                     lines.append(f"• Si {label} → {target_name}")
         elif type_bpmn == 'EndEvent' and not lines:
@@ -541,12 +562,8 @@ class DocumentBuilder:
 
     def _add_annexe_image(self, image_base64: str):
         try:
-            b64 = image_base64.split(',')[1] if image_base64.startswith('data:image') else image_base64
-            image_data = base64.b64decode(b64)
-            p = self.doc.add_paragraph()
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            p.add_run().add_picture(io.BytesIO(image_data), width=Inches(6.3))
-            logger.info(f"✅ Image d'annexe insérée ({len(image_data)} bytes)")
+            size = _add_centered_picture(self.doc, image_base64, Inches(6.3))
+            logger.info(f"✅ Image d'annexe insérée ({size} bytes)")
         except Exception as e:
             logger.error(f"❌ Erreur image d'annexe : {e}")
             p = self.doc.add_paragraph()
@@ -554,6 +571,12 @@ class DocumentBuilder:
 
     # ── Helpers titres ────────────────────────────────────────────────────────
 
+    def _add_bullets(self, items: List[str], style_name: str = 'List Bullet'):
+        """Une puce par élément ; le style est résolu une seule fois pour la liste."""
+        style = self.doc.styles[style_name]
+        for item in items:
+            _run(self.doc.add_paragraph(style=style), item)
+
     def _add_h1(self, text: str):
         """H1 avec fond #0099CC et texte blanc."""
         p = self.doc.add_paragraph(style='Heading 1')
@@ -0,0 +1,45 @@
+# processor/image_prep.py
+"""
+Préparation des images envoyées à Gemini (réduction + encodage)
+Partagée par l'extraction (ImageProcessor) et la classification (ImageClassifier)
+"""
+
+from PIL import Image
+import io
+import logging
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Formats que Gemini lit tels quels (les autres sont ré-encodés en PNG, comme le faisait le SDK)
+_GEMINI_IMAGE_MIMES = frozenset(('image/jpeg', 'image/png', 'image/webp', 'image/heic', 'image/heif'))
+
+# Encodage JPEG des images réduites : qualité abaissée par paliers jusqu'à passer sous la cible
+_JPEG_QUALITIES = (85, 75, 65, 55)
+_JPEG_TARGET_BYTES = 200 * 1024
+
+
+def prepare_gemini_image(image_data: bytes, max_size: int = 1024) -> Tuple[bytes, str, Tuple[int, int], Optional[str]]:
+    """Prépare l'image pour Gemini : (octets, mime, taille, format d'origine).
+    Image déjà petite : octets d'origine, sans décodage (seul l'en-tête est lu).
+    Sinon : réduite à max_size puis encodée en JPEG progressif, qualité 85 tant
+    que le résultat reste sous _JPEG_TARGET_BYTES (55 au plus bas)."""
+    image = Image.open(io.BytesIO(image_data))
+    image_format = image.format
+    if max(image.size) <= max_size:
+        mime_type = Image.MIME.get(image_format)
+        if mime_type in _GEMINI_IMAGE_MIMES:
+            return image_data, mime_type, image.size, image_format
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        return buffer.getvalue(), 'image/png', image.size, image_format
+
+    image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+    for quality in _JPEG_QUALITIES:
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=quality, optimize=True, progressive=True)
+        jpeg_bytes = buffer.getvalue()
+        if len(jpeg_bytes) < _JPEG_TARGET_BYTES:
+            break
+    logger.info(f"Image optimisée: {image.size} px, ~{len(jpeg_bytes)} bytes (qualité {quality})")
+    return jpeg_bytes, 'image/jpeg', image.size, 'JPEG'
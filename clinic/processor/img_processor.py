@@ -7,18 +7,26 @@ VERSION ADAPTATIVE : Classification automatique → Prompt spécialisé
 """
 
 from google import genai
-from PIL import Image
-import io
+from google.genai import types
 import json
 import re
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 import os
 import logging
 import asyncio
+import copy
+import hashlib
 from functools import partial
 import time
 import random
+from collections import Counter, OrderedDict
 from manager.model_manager import GeminiModelManager, GeminiModel
+from processor.image_prep import prepare_gemini_image
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import du classifier et des prompts spécialisés
 from prompts.image_classifier import ImageClassifier
@@ -33,7 +41,130 @@ from prompts.verify_prompt import get_verification_prompt
 
 logger = logging.getLogger(__name__)
 
+# Extraction du JSON des réponses Gemini (objet le plus large + fences markdown)
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*\}')
+_FENCE_JSON_RE = re.compile(r'```json\s*')
+_FENCE_RE = re.compile(r'```\s*')
+
+# Champs texte d'un enrichissement, dans l'ordre de sortie (après "id_tache")
+_ENRICHMENT_TEXT_FIELDS = ("descriptif", "declencheur", "applicatif", "duree_estimee", "frequence", "kpi")
+
+
+def _extract_json_text(text: str) -> str:
+    """Isole le JSON d'une réponse Gemini (texte autour et balises ```json retirés)"""
+    text = text.strip()
+    json_match = _JSON_OBJECT_RE.search(text)
+    if json_match:
+        text = json_match.group(0)
+    # Les deux substitutions ne peuvent rien retirer sans ``` dans le texte
+    if '```' in text:
+        text = _FENCE_JSON_RE.sub('', text)
+        text = _FENCE_RE.sub('', text)
+    return text
+
+
+def _loads_json(text: str) -> Any:
+    """json.loads, via orjson quand il est disponible.
+    Ce qu'orjson refuse (NaN, Infinity...) repasse par json.loads, qui tranche
+    et lève la même JSONDecodeError qu'avant. Seule différence : orjson lit les
+    entiers > 64 bits en float (sans objet ici : ids en chaînes, petits compteurs)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+_MISS = object()
+
+
+class _ResponseCache:
+    """Cache mémoire des résultats validés (LRU borné + expiration).
+    Un verrou par clé : des requêtes identiques simultanées ne paient qu'un seul
+    appel Gemini ; un échec n'est pas mis en cache (la requête suivante retente)."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 86400):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Counter = Counter()
+
+    def _lookup(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISS
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            return _MISS
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Copie : l'appelant peut modifier le résultat sans altérer le cache
+        return copy.deepcopy(entry[1])
+
+    async def get_or_compute(self, key: str, compute) -> Any:
+        value = self._lookup(key)
+        if value is not _MISS:
+            return value
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._lock_users[key] += 1
+        try:
+            async with lock:
+                # Une requête identique a pu remplir l'entrée pendant l'attente du verrou
+                value = self._lookup(key)
+                if value is not _MISS:
+                    return value
+                self.misses += 1
+                value = await compute()
+                self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                return value
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+def _cache_key(*parts: bytes) -> str:
+    """Empreinte courte (128 bits) d'une suite d'octets"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
 class ImageProcessor:
+    # Prompt complet (logique spécialisée + format de sortie) par type d'image,
+    # assemblé une fois à l'import plutôt qu'à chaque extraction (~35 Ko)
+    _EXTRACTION_PROMPTS = {
+        "manuscript": get_logic_manuscript() + "\n\n" + get_extraction_prompt(),
+        "swimlanes": get_logic_swimlanes() + "\n\n" + get_extraction_prompt(),
+        "simple": get_logic_no_lanes() + "\n\n" + get_extraction_prompt(),
+    }
+    # Version des prompts d'extraction : toute modification invalide le cache
+    _EXTRACTION_PROMPTS_DIGEST = _cache_key(
+        ImageClassifier.CLASSIFICATION_PROMPT.encode(),
+        *(prompt.encode() for prompt in _EXTRACTION_PROMPTS.values())
+    ).encode()
+
     def __init__(self):
         """
         Utilise le ModelManager pour gérer les retries et fallbacks
@@ -43,20 +174,31 @@ class ImageProcessor:
             raise ValueError("GOOGLE_API_KEY non configurée")
         
         self.model_manager = GeminiModelManager(api_key)
+        # Classifier créé une fois, sur le même client Gemini que l'extraction
+        self.classifier = ImageClassifier(self.model_manager)
         self.request_timeout = 600  # Timeout par défaut (peut être overridé par classifier)
+        # Résultats d'extraction / amélioration déjà validés, par empreinte de l'entrée
+        self.response_cache = _ResponseCache()
     
     async def extract_workflow(self, image_data: bytes, content_type: str) -> Dict[str, Any]:
         """
         Extrait un workflow ET enrichissements depuis une image
         AVEC classification adaptative pour sélectionner le prompt optimal
+        Une image déjà traitée (mêmes octets, mêmes prompts) est servie depuis le cache
         """
+        key = _cache_key(b"extract", self._EXTRACTION_PROMPTS_DIGEST, image_data)
+        return await self.response_cache.get_or_compute(
+            key, lambda: self._extract_workflow(image_data, content_type)
+        )
+
+    async def _extract_workflow(self, image_data: bytes, content_type: str) -> Dict[str, Any]:
+        """Extraction effective (classification + Gemini), sans cache"""
         try:
             # ============================================
             # PHASE 0 : Classification de l'image avec Gemini
             # ============================================
             logger.info("📊 Phase 0 : Classification de l'image avec Gemini...")
-            classifier = ImageClassifier()
-            classification = await classifier.classify_image(image_data)
+            classification = await self.classifier.classify_image(image_data)
             
             image_type = classification['type']
             confidence = classification['confidence']
@@ -70,15 +212,10 @@ class ImageProcessor:
             # ============================================
             # Optimisation de l'image
             # ============================================
-            image = Image.open(io.BytesIO(image_data))
-            
-            max_size = 1024
-            if max(image.size) > max_size:
-                image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
-                buffer = io.BytesIO()
-                image.save(buffer, format='JPEG', quality=85, optimize=True)
-                image = Image.open(buffer)
-                logger.info(f"Image optimisée: {image.size} px, ~{len(buffer.getvalue())} bytes")
+            # Octets passés tels quels à Gemini : pas de ré-décodage ni de ré-encodage par le SDK
+            # Décodage / LANCZOS / JPEG hors de la boucle d'événements (Pillow relâche le GIL)
+            image_bytes, mime_type, image_size, image_format = await asyncio.to_thread(prepare_gemini_image, image_data)
+            image_part = types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
             
             # ============================================
             # PHASE 1 : Sélection du prompt adaptatif
@@ -86,18 +223,17 @@ class ImageProcessor:
             logger.info(f"🎯 Phase 1 : Sélection prompt pour type '{image_type}'")
             
             if image_type == "manuscript":
-                logic_prompt = get_logic_manuscript()
+                prompt_key = "manuscript"
                 logger.info("📝 Prompt MANUSCRIT activé (correction orthographique)")
             elif image_type == "swimlanes":
-                logic_prompt = get_logic_swimlanes()
+                prompt_key = "swimlanes"
                 logger.info("🏊 Prompt SWIMLANES activé (détection acteurs/outils)")
             else:  # "simple" ou "no_lanes"
-                logic_prompt = get_logic_no_lanes()
+                prompt_key = "simple"
                 logger.info("📋 Prompt SIMPLE activé (flux horizontal sans swimlanes)")
             
-            # Combinaison : Logique spécialisée + Format de sortie
-            format_prompt = get_extraction_prompt()
-            full_prompt = logic_prompt + "\n\n" + format_prompt
+            # Combinaison : Logique spécialisée + Format de sortie (pré-assemblée)
+            full_prompt = self._EXTRACTION_PROMPTS[prompt_key]
             
             # ============================================
             # PHASE 2 : Extraction avec Gemini
@@ -106,12 +242,11 @@ class ImageProcessor:
             
             async def _extract_task(model_name: str):
                 logger.info(f"🔍 Extraction avec {model_name}")
-                model = self.model_manager.get_model(model_name)
+                model = self.model_manager.get_async_model(model_name)
                 response = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        model.generate_content,
+                    model.generate_content(
                         model=model_name,
-                        contents=[full_prompt, image]
+                        contents=[full_prompt, image_part]
                     ),
                     timeout=recommended_timeout
                 )
@@ -137,7 +272,7 @@ class ImageProcessor:
             # ============================================
             # PHASE 4 : Métadonnées enrichies
             # ============================================
-            metadata = self._build_metadata(validated, image)
+            metadata = self._build_metadata(validated, image_size, image_format)
             metadata["model_used"] = result["model_used"]
             metadata["attempts"] = result["attempts"]
             metadata["enrichments_count"] = len(enrichments_dict)
@@ -169,16 +304,22 @@ class ImageProcessor:
     async def improve_workflow(self, workflow: List[Dict[str, str]]) -> Dict[str, Any]:
         """
         Améliore un workflow existant avec Gemini 2.5 Flash
+        Le prompt embarque le workflow : même prompt → résultat servi depuis le cache
         """
+        prompt = get_improvement_prompt(workflow)
+        key = _cache_key(b"improve", prompt.encode())
+        return await self.response_cache.get_or_compute(
+            key, lambda: self._improve_workflow(workflow, prompt)
+        )
+
+    async def _improve_workflow(self, workflow: List[Dict[str, str]], prompt: str) -> Dict[str, Any]:
+        """Amélioration effective via Gemini, sans cache"""
         try:
-            prompt = get_improvement_prompt(workflow)
-            
             async def _improve_task(model_name: str):
                 logger.info(f"🔧 Amélioration avec {model_name}")
-                model = self.model_manager.get_model(model_name)
+                model = self.model_manager.get_async_model(model_name)
                 response = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        model.generate_content,
+                    model.generate_content(
                         model=model_name,
                         contents=prompt
                     ),
@@ -221,25 +362,18 @@ class ImageProcessor:
         Vérifie l'extraction en comparant l'image et le workflow JSON
         """
         try:
-            image = Image.open(io.BytesIO(image_data))
-            
-            max_size = 1024
-            if max(image.size) > max_size:
-                image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
-                buffer = io.BytesIO()
-                image.save(buffer, format='JPEG', quality=85, optimize=True)
-                image = Image.open(buffer)
+            image_bytes, mime_type, _, _ = await asyncio.to_thread(prepare_gemini_image, image_data)
+            image_part = types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
             
             prompt = get_verification_prompt(extracted_workflow)
             
             async def _verify_task(model_name: str):
                 logger.info(f"🔍 Vérification avec {model_name}")
-                model = self.model_manager.get_model(model_name)
+                model = self.model_manager.get_async_model(model_name)
                 response = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        model.generate_content,
+                    model.generate_content(
                         model=model_name,
-                        contents=[prompt, image]
+                        contents=[prompt, image_part]
                     ),
                     timeout=self.request_timeout
                 )
@@ -269,16 +403,8 @@ class ImageProcessor:
     def _parse_gemini_response(self, text: str) -> Tuple[List[Dict[str, str]], str, Dict[str, Dict]]:
         """Parse la réponse JSON de Gemini et retourne (workflow, title, enrichments_dict)"""
         try:
-            text = text.strip()
-            
-            json_match = re.search(r'\{[\s\S]*\}', text)
-            if json_match:
-                text = json_match.group(0)
-            
-            text = re.sub(r'```json\s*', '', text)
-            text = re.sub(r'```\s*', '', text)
-            
-            data = json.loads(text)
+            text = _extract_json_text(text)
+            data = _loads_json(text)
             
             title = data.get("title", "").strip()
             if not title:
@@ -310,15 +436,11 @@ class ImageProcessor:
                     continue
                 task_id = enr.get("id_tache", "")
                 if task_id:
-                    enrichments_dict[task_id] = {
-                        "id_tache": task_id,
-                        "descriptif": enr.get("descriptif", "").strip(),
-                        "declencheur": enr.get("declencheur", "").strip(),
-                        "applicatif": enr.get("applicatif", "").strip(),
-                        "duree_estimee": enr.get("duree_estimee", "").strip(),
-                        "frequence": enr.get("frequence", "").strip(),
-                        "kpi": enr.get("kpi", "").strip()
-                    }
+                    cleaned = {"id_tache": task_id}
+                    get = enr.get
+                    for field in _ENRICHMENT_TEXT_FIELDS:
+                        cleaned[field] = get(field, "").strip()
+                    enrichments_dict[task_id] = cleaned
             
             logger.info(f"✓ Titre: '{title}' - {len(workflow)} étapes, {len(enrichments_dict)} enrichies")
             return workflow, title, enrichments_dict
@@ -392,7 +514,25 @@ class ImageProcessor:
         logger.info(f"✅ Workflow validé: {len(validated)} étapes")
         return validated
     
-    def _build_metadata(self, workflow: List[Dict[str, str]], image: Image.Image) -> Dict[str, Any]:
+    def _workflow_stats(self, workflow: List[Dict[str, str]]) -> Dict[str, int]:
+        """Compteurs par type BPMN, en un seul passage sur le workflow"""
+        counts = Counter(s["typeBpmn"] for s in workflow)
+        exclusive = counts["ExclusiveGateway"]
+        parallel = counts["ParallelGateway"]
+        inclusive = counts["InclusiveGateway"]
+        return {
+            "total_steps": len(workflow),
+            "start_events": counts["StartEvent"],
+            "end_events": counts["EndEvent"],
+            "tasks": counts["Task"],
+            "exclusive_gateways": exclusive,
+            "parallel_gateways": parallel,
+            "inclusive_gateways": inclusive,
+            "gateways": exclusive + parallel + inclusive
+        }
+
+    def _build_metadata(self, workflow: List[Dict[str, str]],
+                        image_size: Tuple[int, int], image_format: Optional[str]) -> Dict[str, Any]:
         """Construit les métadonnées du workflow"""
         actors = list(set(s["acteur"] for s in workflow if s["acteur"]))
         departments = list(set(s["département"] for s in workflow if s["département"]))
@@ -400,19 +540,10 @@ class ImageProcessor:
         
         return {
             "image_info": {
-                "size": f"{image.width}x{image.height}",
-                "format": image.format
-            },
-            "workflow_stats": {
-                "total_steps": len(workflow),
-                "start_events": sum(1 for s in workflow if s["typeBpmn"] == "StartEvent"),
-                "end_events": sum(1 for s in workflow if s["typeBpmn"] == "EndEvent"),
-                "tasks": sum(1 for s in workflow if s["typeBpmn"] == "Task"),
-                "exclusive_gateways": sum(1 for s in workflow if s["typeBpmn"] == "ExclusiveGateway"),
-                "parallel_gateways": sum(1 for s in workflow if s["typeBpmn"] == "ParallelGateway"),
-                "inclusive_gateways": sum(1 for s in workflow if s["typeBpmn"] == "InclusiveGateway"),
-                "gateways": sum(1 for s in workflow if s["typeBpmn"] in ("ExclusiveGateway", "ParallelGateway", "InclusiveGateway"))
+                "size": f"{image_size[0]}x{image_size[1]}",
+                "format": image_format
             },
+            "workflow_stats": self._workflow_stats(workflow),
             "business_info": {
                 "actors": actors if actors else ["Non spécifié"],
                 "actors_count": len(actors),
@@ -445,16 +576,7 @@ class ImageProcessor:
                 "tools_added": list(improved_tools - original_tools),
                 "tools_removed": list(original_tools - original_tools)
             },
-            "workflow_stats": {
-                "total_steps": len(improved),
-                "start_events": sum(1 for s in improved if s["typeBpmn"] == "StartEvent"),
-                "end_events": sum(1 for s in improved if s["typeBpmn"] == "EndEvent"),
-                "tasks": sum(1 for s in improved if s["typeBpmn"] == "Task"),
-                "exclusive_gateways": sum(1 for s in improved if s["typeBpmn"] == "ExclusiveGateway"),
-                "parallel_gateways": sum(1 for s in improved if s["typeBpmn"] == "ParallelGateway"),
-                "inclusive_gateways": sum(1 for s in improved if s["typeBpmn"] == "InclusiveGateway"),
-                "gateways": sum(1 for s in improved if s["typeBpmn"] in ("ExclusiveGateway", "ParallelGateway", "InclusiveGateway"))
-            },
+            "workflow_stats": self._workflow_stats(improved),
             "improvements": {
                 "steps_reformulated": sum(
                     1 for i, orig in enumerate(original) 
@@ -468,16 +590,8 @@ class ImageProcessor:
     def _parse_verification_response(self, text: str) -> Dict[str, Any]:
         """Parse la réponse de vérification de Gemini"""
         try:
-            text = text.strip()
-            
-            json_match = re.search(r'\{[\s\S]*\}', text)
-            if json_match:
-                text = json_match.group(0)
-            
-            text = re.sub(r'```json\s*', '', text)
-            text = re.sub(r'```\s*', '', text)
-            
-            data = json.loads(text)
+            text = _extract_json_text(text)
+            data = _loads_json(text)
             
             if "verification_result" in data:
                 result = data["verification_result"]
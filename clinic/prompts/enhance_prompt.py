@@ -14,18 +14,13 @@ def get_improvement_prompt(workflow: List[Dict[str, str]]) -> str:
         workflow: Tableau Table1Row[] existant à améliorer
         
     Returns:
-        str: Prompt formaté avec le workflow intégré
+        str: Prompt formaté avec le workflow intégré (JSON en fin de prompt : préfixe stable)
     """
     workflow_json = json.dumps(workflow, ensure_ascii=False, indent=2)
     
     return f"""Tu es un expert en modélisation de processus métier BPMN. 
 
-🎯 MISSION: Améliorer le workflow suivant pour qu'il soit plus professionnel, cohérent et exploitable.
-
-📋 WORKFLOW ACTUEL:
-```json
-{workflow_json}
-```
+🎯 MISSION: Améliorer le workflow fourni en fin de message pour qu'il soit plus professionnel, cohérent et exploitable.
 
 ✨ AMÉLIORATIONS À APPORTER:
 
@@ -78,4 +73,9 @@ def get_improvement_prompt(workflow: List[Dict[str, str]]) -> str:
   ]
 }}
 
-🚀 AMÉLIORE MAINTENANT LE WORKFLOW:"""
\ No newline at end of file
+🚀 AMÉLIORE MAINTENANT LE WORKFLOW:
+
+📋 WORKFLOW ACTUEL:
+```json
+{workflow_json}
+```"""
\ No newline at end of file
@@ -4,14 +4,17 @@ Classificateur d'images BPMN avec Gemini
 Classification rapide et précise en ~10 secondes
 """
 
-from google import genai
+from google.genai import types
 from PIL import Image
 import io
-from typing import Dict
+from typing import Dict, Optional
 import logging
 import asyncio
 import os
 
+from manager.model_manager import GeminiModelManager, GeminiModel
+from processor.image_prep import prepare_gemini_image
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,13 +37,18 @@ RÈGLES CRITIQUES :
 
 Réponds UNIQUEMENT avec un seul mot : swimlanes, manuscript, ou simple"""
 
-    def __init__(self):
-        """Initialise le classifier avec l'API Gemini"""
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY non configurée")
+    # Modèle léger : un seul mot attendu, sous 15 s
+    CLASSIFICATION_MODEL = GeminiModel.FLASH_LITE.value
+
+    def __init__(self, model_manager: Optional[GeminiModelManager] = None):
+        """Initialise le classifier avec l'API Gemini (client partagé si un ModelManager est fourni)"""
+        if model_manager is None:
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("GOOGLE_API_KEY non configurée")
+            model_manager = GeminiModelManager(api_key)
         
-        self.client = genai.Client(api_key=api_key)
+        self.model_manager = model_manager
     
     async def classify_image(self, image_data: bytes) -> Dict[str, any]:
         """
@@ -59,21 +67,21 @@ Réponds UNIQUEMENT avec un seul mot : swimlanes, manuscript, ou simple"""
             }
         """
         try:
-            # Optimisation de l'image pour classification rapide
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Réduire à 512px max pour classification (plus rapide)
-            max_size = 512
-            if max(image.size) > max_size:
-                image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+            # Réduction à 512px max (classification plus rapide) + encodage,
+            # décodage compris, hors de la boucle d'événements
+            image_bytes, mime_type, image_size, _ = await asyncio.to_thread(
+                prepare_gemini_image, image_data, 512
+            )
+            image_part = types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
             
-            logger.info(f"📊 Classification Gemini de l'image ({image.size[0]}x{image.size[1]}px)")
+            logger.info(f"📊 Classification Gemini de l'image ({image_size[0]}x{image_size[1]}px)")
             
-            # Appel Gemini avec timeout court
+            # Appel Gemini (client asynchrone) avec timeout court
+            model = self.model_manager.get_async_model(self.CLASSIFICATION_MODEL)
             response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    self.model.generate_content,
-                    [self.CLASSIFICATION_PROMPT, image]
+                model.generate_content(
+                    model=self.CLASSIFICATION_MODEL,
+                    contents=[self.CLASSIFICATION_PROMPT, image_part]
                 ),
                 timeout=15  # 15 secondes max pour classification
             )
@@ -109,7 +117,7 @@ Réponds UNIQUEMENT avec un seul mot : swimlanes, manuscript, ou simple"""
                 "method": "gemini",
                 "debug": {
                     "raw_response": classification_text,
-                    "image_size": f"{image.size[0]}x{image.size[1]}"
+                    "image_size": f"{image_size[0]}x{image_size[1]}"
                 }
             }
             
@@ -122,11 +130,15 @@ Réponds UNIQUEMENT avec un seul mot : swimlanes, manuscript, ou simple"""
             
         except asyncio.TimeoutError:
             logger.error("⏱️ Timeout classification Gemini → Fallback heuristique")
-            return self._fallback_heuristic_classification(image_data)
+            return await self._run_fallback(image_data)
             
         except Exception as e:
             logger.error(f"❌ Erreur classification Gemini: {str(e)} → Fallback heuristique")
-            return self._fallback_heuristic_classification(image_data)
+            return await self._run_fallback(image_data)
+    
+    async def _run_fallback(self, image_data: bytes) -> Dict[str, any]:
+        """Fallback heuristique (décodage pleine résolution + NumPy) hors de la boucle d'événements"""
+        return await asyncio.to_thread(self._fallback_heuristic_classification, image_data)
     
     def _fallback_heuristic_classification(self, image_data: bytes) -> Dict[str, any]:
         """
@@ -136,10 +148,13 @@ Réponds UNIQUEMENT avec un seul mot : swimlanes, manuscript, ou simple"""
         try:
             import numpy as np
             
-            image = Image.open(io.BytesIO(image_data)).convert('RGB')
-            img_array = np.array(image)
-            height, width = img_array.shape[:2]
-            gray = np.mean(img_array, axis=2).astype(np.uint8)
+            image = Image.open(io.BytesIO(image_data))
+            if image.mode == 'L':
+                # Déjà en niveaux de gris : la moyenne de 3 canaux identiques redonne la même valeur
+                gray = np.array(image)
+            else:
+                gray = np.mean(np.array(image.convert('RGB')), axis=2).astype(np.uint8)
+            height, width = gray.shape
             
             # Détection rapide de swimlanes (lignes horizontales)
             binary = gray < 200
@@ -147,35 +162,27 @@ Réponds UNIQUEMENT avec un seul mot : swimlanes, manuscript, ou simple"""
             threshold = width * 0.4  # 40% au lieu de 50% (plus tolérant)
             potential_lanes = horizontal_projection > threshold
             
-            lane_count = 0
-            in_lane = False
-            current_height = 0
-            
-            for has_line in potential_lanes:
-                if has_line:
-                    if not in_lane:
-                        in_lane = True
-                        current_height = 1
-                    else:
-                        current_height += 1
-                else:
-                    if in_lane and current_height >= 3:
-                        lane_count += 1
-                    in_lane = False
-                    current_height = 0
-            
+            # Bandes = suites de lignes "pleines" d'au moins 3px, terminées par une ligne vide
+            # (une suite qui touche le bas de l'image n'est pas comptée)
+            edges = np.diff(potential_lanes.astype(np.int8), prepend=np.int8(0))
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1)
+            lane_count = int(np.count_nonzero(ends - starts[:len(ends)] >= 3))
+
             has_swimlanes = lane_count >= 2
             
             # Variance pour manuscrit (seuil plus élevé)
-            variances = []
+            # Fenêtres 5x5 tous les 20px, extraites d'un coup par indexation (ny, nx, 5, 5)
             step = 20
-            for y in range(0, height - 5, step):
-                for x in range(0, width - 5, step):
-                    window = gray[y:y+5, x:x+5]
-                    variance = np.var(window)
-                    variances.append(variance)
-            
-            avg_variance = np.mean(variances) if variances else 0
+            ys = np.arange(0, height - 5, step)
+            xs = np.arange(0, width - 5, step)
+            if ys.size and xs.size:
+                offsets = np.arange(5)
+                windows = gray[(ys[:, None] + offsets)[:, None, :, None],
+                               (xs[:, None] + offsets)[None, :, None, :]]
+                avg_variance = np.mean(windows.reshape(-1, 25).var(axis=1))
+            else:
+                avg_variance = 0
             is_manuscript = avg_variance > 1500  # Seuil augmenté de 800 à 1500
             
             # Décision avec PRIORITÉ SWIMLANES
@@ -14,7 +14,7 @@ def get_verification_prompt(extracted_workflow: List[Dict[str, str]]) -> str:
         extracted_workflow: Workflow déjà extrait à vérifier
         
     Returns:
-        str: Prompt formaté avec le workflow intégré
+        str: Prompt formaté avec le workflow intégré (JSON en fin de prompt : préfixe stable)
     """
     workflow_json = json.dumps(extracted_workflow, ensure_ascii=False, indent=2)
     
@@ -22,13 +22,6 @@ def get_verification_prompt(extracted_workflow: List[Dict[str, str]]) -> str:
 
 🎯 OBJECTIF: Comparer l'image du processus avec le JSON extrait et LISTER PRÉCISÉMENT ce qui a été MANQUÉ ou MAL EXTRAIT.
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📊 WORKFLOW DÉJÀ EXTRAIT (À VÉRIFIER)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-```json
-{workflow_json}
-```
-
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 🔍 MÉTHODOLOGIE D'ANALYSE
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -181,4 +174,11 @@ def get_verification_prompt(extracted_workflow: List[Dict[str, str]]) -> str:
 🚀 COMMENCE L'ANALYSE MAINTENANT
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-Analyse l'image, compare avec le JSON, et liste PRÉCISÉMENT ce qui manque."""
\ No newline at end of file
+Analyse l'image, compare avec le JSON ci-dessous, et liste PRÉCISÉMENT ce qui manque.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📊 WORKFLOW DÉJÀ EXTRAIT (À VÉRIFIER)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+```json
+{workflow_json}
+```"""
\ No newline at end of file
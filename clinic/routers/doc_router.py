@@ -7,6 +7,7 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field, validator
 from typing import List, Dict, Optional, Literal, Union, Tuple
 from urllib.parse import quote
+import asyncio
 import logging
 import os
 import tempfile
@@ -176,7 +177,9 @@ async def generate_document(request: GenerateDocumentRequest):
     try:
         builder = DocumentBuilder()
 
-        file_path = builder.generate_process_report(
+        # Construction + sérialisation du .docx (CPU/zip) hors de la boucle d'événements
+        file_path = await asyncio.to_thread(
+            builder.generate_process_report,
             metadata=request.metadata.dict(),
             workflow=[s.dict() for s in request.workflow],
             enrichments={k: v.dict() for k, v in request.enrichments.items()},
@@ -251,15 +254,33 @@ def cleanup_file(file_path: str):
         logger.warning(f"⚠️ Nettoyage : {e}")
 
 
+_GATEWAY_TYPES = frozenset(('ExclusiveGateway', 'ParallelGateway', 'InclusiveGateway'))
+_EVENT_TYPES = frozenset(('StartEvent', 'EndEvent'))
+
+
 def _calculate_preview_stats(workflow, enrichments, options=None, has_diagram=False, metadata=None):
-    actors = set(s.acteur for s in workflow if s.acteur)
-    departments = set(s.département for s in workflow if s.département)
-    tools = set(s.outil for s in workflow if s.outil)
+    # Un seul parcours du workflow pour tous les compteurs
+    actors, departments, tools = set(), set(), set()
+    tasks = gateways = events = 0
+    for s in workflow:
+        type_bpmn = s.typeBpmn
+        if type_bpmn == 'Task':
+            tasks += 1
+        elif type_bpmn in _GATEWAY_TYPES:
+            gateways += 1
+        elif type_bpmn in _EVENT_TYPES:
+            events += 1
+        if s.acteur:
+            actors.add(s.acteur)
+        if s.département:
+            departments.add(s.département)
+        if s.outil:
+            tools.add(s.outil)
     return {
         "total_steps": len(workflow),
-        "tasks": sum(1 for s in workflow if s.typeBpmn == 'Task'),
-        "gateways": sum(1 for s in workflow if s.typeBpmn in ['ExclusiveGateway', 'ParallelGateway', 'InclusiveGateway']),
-        "events": sum(1 for s in workflow if s.typeBpmn in ['StartEvent', 'EndEvent']),
+        "tasks": tasks,
+        "gateways": gateways,
+        "events": events,
         "actors_count": len(actors),
         "departments_count": len(departments),
         "tools_count": len(tools),
@@ -182,6 +182,7 @@ async def get_info():
         ],
         "supported_formats": ["PNG", "JPG", "JPEG", "WebP"],
         "max_file_size": "10MB",
+        "response_cache": _processor.response_cache.stats() if _processor is not None else None,
         "procedure_metadata_fields": {
             "nom": "Titre complet du processus",
             "ref": "Référence documentaire",
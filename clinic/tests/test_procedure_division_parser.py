@@ -0,0 +1,64 @@
+"""
+Tests du parser PROCEDURE DIVISION : séparateurs d'opérandes, en-tête de division
+Lancement : cd clinic && python -m unittest discover tests
+"""
+
+import unittest
+
+from parsers.procedure_division_parser import make_parser
+
+
+def _parse_statements(*statements):
+    lines = ["       PROCEDURE DIVISION.", "       MAIN-PARA."]
+    lines += [f"           {s}" for s in statements]
+    division = make_parser(lines, has_line_nums=False).parse()
+    return division["paragraphs"][0].statements
+
+
+class TestOperandSeparators(unittest.TestCase):
+
+    def test_move_with_tab_and_multiple_spaces(self):
+        for line in ("MOVE A\tTO B.", "MOVE A   TO    B.", "MOVE A \t TO\tB C."):
+            with self.subTest(line=line):
+                move = _parse_statements(line)[0]
+                self.assertEqual(move.source, "A")
+                self.assertEqual(move.targets[0], "B")
+
+    def test_arithmetic_with_tab_and_multiple_spaces(self):
+        add, subtract, multiply, divide = _parse_statements(
+            "ADD X\tTO Y.",
+            "SUBTRACT X   FROM\tY.",
+            "MULTIPLY X \t BY Y GIVING Z.",
+            "DIVIDE X\t\tINTO Y.",
+        )
+        self.assertEqual((add.operand1, add.operand2), ("X", "Y"))
+        self.assertEqual((subtract.operand1, subtract.operand2), ("X", "Y"))
+        self.assertEqual((multiply.operand1, multiply.operand2, multiply.giving), ("X", "Y", "Z"))
+        self.assertEqual((divide.operand1, divide.operand2), ("X", "Y"))
+
+    def test_separator_inside_word_is_ignored(self):
+        move = _parse_statements("MOVE TOTAL TO TOTAL-OUT.")[0]
+        self.assertEqual(move.source, "TOTAL")
+        self.assertEqual(move.targets, ["TOTAL-OUT"])
+
+
+class TestDivisionHeader(unittest.TestCase):
+
+    def test_division_mentioned_in_comment_is_skipped(self):
+        lines = [
+            "      * THIS IS THE PROCEDURE DIVISION.",
+            "       PROCEDURE DIVISION",
+            "           USING LK-A",
+            "                 LK-B.",
+            "       MAIN-PARA.",
+            "           MOVE LK-A TO LK-B.",
+        ]
+        for has_line_nums in (False, True):
+            with self.subTest(has_line_nums=has_line_nums):
+                division = make_parser(lines, has_line_nums).parse()
+                self.assertEqual(division["using_clause"], ["LK-A", "LK-B"])
+                self.assertEqual([p.name for p in division["paragraphs"]], ["MAIN-PARA"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""
+Tests du parser WinDev : dispatch des instructions sur le mot-clé de tête
+Lancement : cd clinic && python -m unittest discover tests
+"""
+
+import unittest
+
+from parsers.windev_parser import WinDevParser
+
+
+class TestKeywordDispatch(unittest.TestCase):
+
+    def test_keyword_followed_by_parenthesis_is_not_a_function_call(self):
+        code = "\n".join([
+            "PROCÉDURE Test(a)",
+            "SI(a>1) ALORS",
+            "RENVOYER(a)",
+            "FIN",
+        ])
+        program = WinDevParser(code).parse()
+        procedure = program.children[0]
+
+        self.assertEqual(program.metadata["functions_called"], [])
+        self.assertNotIn("FunctionCall", [child.type for child in procedure.children])
+        self.assertEqual(procedure.metadata["body_statements"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()